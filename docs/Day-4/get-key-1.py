@@ -1,21 +1,18 @@
+import sys
 import oci
 import base64
 
 config = oci.config.from_file()
 print(config)
 
-#config = oci.config.from_file()
+# Secrets endpoint is derived from the region in ~/.oci/config
+secrets_client = oci.secrets.SecretsClient(config)
+print(f"Using {secrets_client.base_client.endpoint}")
 
-# IMPORTANT → Set secrets endpoint for your region
-secrets_client = oci.secrets.SecretsClient(
-    config,
-    service_endpoint="https://secrets.vaults.eu-frankfurt-1.oci.oraclecloud.com"
-)
-
-secret_id = "ocid1.vaultsecret.oc1.eu-frankfurt-1.amaaaaaahqssvraa3p6yz2l6nfp6d4i2jx7z5unqrlfyag3mhwuokj6ew2mq"
+secret_id = sys.argv[1] if len(sys.argv) > 1 else "ocid1.vaultsecret.oc1.eu-frankfurt-1.amaaaaaahqssvraa3p6yz2l6nfp6d4i2jx7z5unqrlfyag3mhwuokj6ew2mq"
 
 bundle = secrets_client.get_secret_bundle(secret_id).data
 encoded = bundle.secret_bundle_content.content
 decoded = base64.b64decode(encoded).decode()
 
-print(decoded)
\ No newline at end of file
+print(decoded)
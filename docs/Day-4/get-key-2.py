@@ -1,16 +1,15 @@
+import sys
 import oci
 import base64
 
 signer = oci.auth.signers.InstancePrincipalsSecurityTokenSigner()
 
-client = oci.secrets.SecretsClient(
-    config={},
-    signer=signer,
-    service_endpoint="https://secrets.vaults.eu-frankfurt-1.oci.oraclecloud.com"
-)
+# Secrets endpoint is derived from the instance's region (signer.region)
+client = oci.secrets.SecretsClient(config={"region": signer.region}, signer=signer)
+print(f"Using {client.base_client.endpoint}")
 
-secret_id = "ocid1.vaultsecret.oc1.eu-frankfurt-1.amaaaaaahqssvraa3p6yz2l6nfp6d4i2jx7z5unqrlfyag3mhwuokj6ew2mq"
+secret_id = sys.argv[1] if len(sys.argv) > 1 else "ocid1.vaultsecret.oc1.eu-frankfurt-1.amaaaaaahqssvraa3p6yz2l6nfp6d4i2jx7z5unqrlfyag3mhwuokj6ew2mq"
 bundle = client.get_secret_bundle(secret_id).data
 
 decoded = base64.b64decode(bundle.secret_bundle_content.content).decode()
-print(decoded)
\ No newline at end of file
+print(decoded)
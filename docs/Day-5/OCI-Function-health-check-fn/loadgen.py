@@ -0,0 +1,411 @@
+"""
+loadgen.py — open-loop synthetic load for the BharatMart health and API endpoints.
+
+Sends requests on a fixed schedule (constant rate or a linear ramp) across
+weighted targets, whether or not earlier requests have completed, so a slow
+backend is measured instead of slowing the test down.
+
+- Targets default to HEALTH_URLS (the same list func.py checks)
+- Latency is taken from each request's *scheduled* send time, so time spent
+  waiting behind a stalled backend, the connection pool or the generator
+  itself is counted (coordinated-omission correction); service time from the
+  actual send is reported next to it
+- HDR histograms (3 significant digits, 1 us .. 60 s) per target and overall
+- Prometheus text on --metrics-port (/metrics, bound to 127.0.0.1 unless
+  --metrics-host says otherwise) while running and for --linger seconds
+  after, plus an optional --prom-file snapshot; point the metrics collector
+  at it to push the run to OCI Monitoring
+- Final JSON summary on stdout; overall_status is "degraded" when p99 exceeds
+  LATENCY_THRESHOLD_MS or any request failed, like func.py
+
+Usage:
+    python3 loadgen.py --rate 20 --duration 120
+    python3 loadgen.py --base-url http://<lb-ip>:3000 \
+        --target /api/health=1 --target /api/products=6 --target /api/cart=3 \
+        --rate 10 --ramp-to 300 --duration 600 --metrics-port 9610
+
+Settings come from flags, the environment, or a .env next to this script
+(copy env.example). Needs aiohttp and python-dotenv, which are not part of
+the function image: pip install aiohttp python-dotenv
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import logging
+import argparse
+from datetime import datetime, timezone
+
+import aiohttp
+from aiohttp import web
+from dotenv import load_dotenv
+
+logger = logging.getLogger("loadgen")
+
+# Configuration from .env / environment (flags override)
+load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env"))
+HEALTH_URLS = os.getenv("HEALTH_URLS", "http://localhost:3000/api/health")
+REQUEST_TIMEOUT = float(os.getenv("REQUEST_TIMEOUT", "5"))
+LATENCY_THRESHOLD_MS = int(os.getenv("LATENCY_THRESHOLD_MS", "1000"))
+LOADGEN_TARGETS = os.getenv("LOADGEN_TARGETS", "")
+LOADGEN_BASE_URL = os.getenv("LOADGEN_BASE_URL", "")
+
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+
+# -------------------------------------------------------
+# HDR histogram
+# -------------------------------------------------------
+class Histogram:
+    """
+    Integer values (microseconds) in log-linear buckets: every power-of-two
+    range is split into 2048 sub-buckets, so any recorded value is known to
+    within 0.1% at a fixed ~140 KB regardless of how many are recorded.
+    Values above highest are clamped to it.
+    """
+
+    SUB_BUCKET_BITS = 11  # 2048 sub-buckets -> 3 significant digits
+    HALF_BITS = SUB_BUCKET_BITS - 1
+    HALF = 1 << HALF_BITS
+
+    def __init__(self, highest=60_000_000):
+        self.highest = highest
+        buckets = max(1, highest.bit_length() - self.SUB_BUCKET_BITS + 1)
+        self.counts = [0] * ((buckets + 1) << self.HALF_BITS)
+        self.total = 0
+        self.sum = 0
+        self.max = 0
+
+    def _index(self, value):
+        bucket = max(0, value.bit_length() - self.SUB_BUCKET_BITS)
+        return ((bucket + 1) << self.HALF_BITS) + (value >> bucket) - self.HALF
+
+    def _highest_equivalent(self, index):
+        bucket = (index >> self.HALF_BITS) - 1
+        sub = (index & (self.HALF - 1)) + self.HALF
+        if bucket < 0:
+            bucket, sub = 0, sub - self.HALF
+        return (sub << bucket) + (1 << bucket) - 1
+
+    def record(self, value):
+        value = min(max(0, int(value)), self.highest)
+        self.counts[self._index(value)] += 1
+        self.total += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def percentiles(self, quantiles):
+        """
+        {q: value} for ascending quantiles, in one pass over the buckets.
+        """
+        result = {}
+        if not self.total:
+            return {q: 0 for q in quantiles}
+        pending = list(quantiles)
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if not count:
+                continue
+            seen += count
+            while pending and seen >= max(1, pending[0] * self.total):
+                result[pending.pop(0)] = min(self._highest_equivalent(index), self.max)
+            if not pending:
+                break
+        return result
+
+
+# -------------------------------------------------------
+# Targets and schedule
+# -------------------------------------------------------
+def parse_targets(specs, base_url):
+    """
+    "URL[=weight]" or "/path[=weight]" (joined to base_url) -> [(url, weight)].
+    """
+    targets = []
+    for spec in specs:
+        url, _, weight = spec.strip().partition("=")
+        if not url:
+            continue
+        if url.startswith("/"):
+            if not base_url:
+                raise SystemExit(f"Target {url} is a path; set --base-url or LOADGEN_BASE_URL")
+            url = base_url.rstrip("/") + url
+        targets.append((url, float(weight or 1)))
+    if not targets:
+        raise SystemExit("No targets (set --target, LOADGEN_TARGETS or HEALTH_URLS)")
+    return targets
+
+
+def schedule(rate, ramp_to, duration):
+    """
+    Intended send offsets (seconds from start) for a rate moving linearly
+    from rate to ramp_to over duration: the i-th send is where the
+    integrated rate reaches i.
+    """
+    slope = (ramp_to - rate) / duration
+    total = int((rate + ramp_to) / 2 * duration)
+    for i in range(total):
+        # Solves rate*t + slope*t^2/2 = i (stable form, also for slope == 0)
+        root = (rate * rate + 2 * slope * i) ** 0.5
+        yield 2 * i / (rate + root) if rate + root > 0 else 0.0
+
+
+# -------------------------------------------------------
+# Results
+# -------------------------------------------------------
+class TargetStats:
+    __slots__ = ("latency", "service", "outcomes")
+
+    def __init__(self):
+        self.latency = Histogram()  # from the scheduled send time
+        self.service = Histogram()  # from the actual send
+        self.outcomes = {}
+
+    def record(self, latency, service, outcome):
+        if outcome != "error":  # connection failures carry no response time
+            self.latency.record(latency * 1e6)
+            self.service.record(service * 1e6)
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+
+
+class Results:
+    def __init__(self, targets):
+        self.targets = {url: TargetStats() for url, _ in targets}
+        self.overall = TargetStats()
+        self.target_rate = 0.0
+        self.in_flight = 0
+        self.max_send_lag = 0.0
+
+    def record(self, url, latency, service, outcome):
+        self.targets[url].record(latency, service, outcome)
+        self.overall.record(latency, service, outcome)
+
+    def failed(self):
+        return sum(n for outcome, n in self.overall.outcomes.items() if outcome not in ("2xx", "3xx"))
+
+    def render(self):
+        """
+        Prometheus text. Latencies are summaries (quantile gauges plus
+        _sum/_count), which the metrics collector turns into OCI streams
+        per target and quantile plus an _avg.
+        """
+        out = []
+        for name, attr, help_text in (
+            ("loadgen_latency_seconds", "latency", "Response time from the scheduled send time (coordinated-omission corrected)"),
+            ("loadgen_service_time_seconds", "service", "Response time from the actual send"),
+        ):
+            out.append(f"# HELP {name} {help_text}")
+            out.append(f"# TYPE {name} summary")
+            for url, stats in self.targets.items():
+                hist = getattr(stats, attr)
+                for q, value in hist.percentiles(QUANTILES).items():
+                    out.append(f'{name}{{target="{url}",quantile="{q}"}} {value / 1e6:.6f}')
+                out.append(f'{name}{{target="{url}",quantile="1"}} {hist.max / 1e6:.6f}')
+                out.append(f'{name}_sum{{target="{url}"}} {hist.sum / 1e6:.6f}')
+                out.append(f'{name}_count{{target="{url}"}} {hist.total}')
+
+        out.append("# HELP loadgen_requests_total Completed requests by outcome (2xx..5xx, timeout, error)")
+        out.append("# TYPE loadgen_requests_total counter")
+        for url, stats in self.targets.items():
+            for outcome, count in sorted(stats.outcomes.items()):
+                out.append(f'loadgen_requests_total{{target="{url}",outcome="{outcome}"}} {count}')
+
+        for name, value, help_text in (
+            ("loadgen_target_rate", self.target_rate, "Scheduled requests per second"),
+            ("loadgen_in_flight", self.in_flight, "Requests sent and not yet completed"),
+            ("loadgen_max_send_lag_seconds", self.max_send_lag, "Worst delay of a send behind its schedule (generator saturation)"),
+        ):
+            out.append(f"# HELP {name} {help_text}")
+            out.append(f"# TYPE {name} gauge")
+            out.append(f"{name} {value:.6g}")
+        return "\n".join(out) + "\n"
+
+    def summary(self, started_at, duration_ms):
+        def ms(hist):
+            values = hist.percentiles(QUANTILES)
+            row = {f"p{q * 100:g}": round(values[q] / 1000, 2) for q in QUANTILES}
+            row["max"] = round(hist.max / 1000, 2)
+            return row
+
+        p99_ms = self.overall.latency.percentiles((0.99,))[0.99] / 1000
+        failed = self.failed()
+        return {
+            "run_id": f"load-{int(time.time())}",
+            "timestamp": started_at,
+            "duration_ms": duration_ms,
+            "overall_status": "ok" if p99_ms <= LATENCY_THRESHOLD_MS and not failed else "degraded",
+            "latency_threshold_ms": LATENCY_THRESHOLD_MS,
+            "requests": self.overall.latency.total + self.overall.outcomes.get("error", 0),
+            "failed": failed,
+            "max_send_lag_ms": round(self.max_send_lag * 1000, 2),
+            "results": [
+                {
+                    "target": url,
+                    "outcomes": stats.outcomes,
+                    "latency_ms": ms(stats.latency),
+                    "service_time_ms": ms(stats.service),
+                }
+                for url, stats in self.targets.items()
+            ],
+        }
+
+
+def write_prom_file(path, results):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(results.render())
+    os.replace(tmp, path)
+
+
+# -------------------------------------------------------
+# Load loop
+# -------------------------------------------------------
+async def fire(session, url, intended, results):
+    loop = asyncio.get_running_loop()
+    sent = loop.time()
+    results.in_flight += 1
+    try:
+        async with session.get(url) as resp:
+            await resp.read()
+            outcome = f"{resp.status // 100}xx"
+    except asyncio.TimeoutError:
+        outcome = "timeout"
+    except (aiohttp.ClientError, OSError):
+        outcome = "error"
+    finally:
+        results.in_flight -= 1
+    done = loop.time()
+    results.record(url, done - intended, done - sent, outcome)
+
+
+async def report(results, args, start):
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(args.report_interval)
+        overall = results.overall
+        lat = overall.latency.percentiles((0.5, 0.99))
+        svc = overall.service.percentiles((0.99,))
+        logger.info(
+            f"t={loop.time() - start:.0f}s rate={results.target_rate:.0f}/s "
+            f"done={sum(overall.outcomes.values())} failed={results.failed()} in_flight={results.in_flight} "
+            f"p50={lat[0.5] / 1000:.1f}ms p99={lat[0.99] / 1000:.1f}ms "
+            f"(service p99={svc[0.99] / 1000:.1f}ms) max_lag={results.max_send_lag * 1000:.1f}ms"
+        )
+        if args.prom_file:
+            write_prom_file(args.prom_file, results)
+
+
+async def generate(args, targets, results):
+    rng = random.Random(args.seed)
+    urls = [url for url, _ in targets]
+    cum_weights = []
+    acc = 0.0
+    for _, weight in targets:
+        acc += weight
+        cum_weights.append(acc)
+
+    connector = aiohttp.TCPConnector(limit=args.max_connections)
+    timeout = aiohttp.ClientTimeout(total=args.timeout)
+    loop = asyncio.get_running_loop()
+    pending = set()
+
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        start = loop.time()
+        reporter = asyncio.create_task(report(results, args, start))
+        slope = (args.ramp_to - args.rate) / args.duration
+
+        for offset in schedule(args.rate, args.ramp_to, args.duration):
+            intended = start + offset
+            now = loop.time()
+            if intended > now:
+                await asyncio.sleep(intended - now)
+            else:
+                # Behind schedule: send now, still measured from intended
+                results.max_send_lag = max(results.max_send_lag, now - intended)
+            results.target_rate = args.rate + slope * offset
+            url = rng.choices(urls, cum_weights=cum_weights)[0]
+            task = asyncio.create_task(fire(session, url, intended, results))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+
+        if pending:
+            await asyncio.wait(pending)
+        reporter.cancel()
+        return loop.time() - start
+
+
+async def serve_metrics(results, host, port):
+    async def metrics(_):
+        return web.Response(text=results.render(), content_type="text/plain", charset="utf-8")
+
+    app = web.Application()
+    app.router.add_get("/metrics", metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logger.info(f"Serving load-test metrics on {host}:{port}/metrics")
+    return runner
+
+
+async def main_async(args):
+    targets = parse_targets(args.target or (LOADGEN_TARGETS or HEALTH_URLS).split(","), args.base_url)
+    results = Results(targets)
+    runner = await serve_metrics(results, args.metrics_host, args.metrics_port) if args.metrics_port else None
+
+    logger.info(
+        f"Open-loop load: {args.rate:g} -> {args.ramp_to:g} req/s over {args.duration:g}s "
+        f"across {', '.join(f'{url} (x{weight:g})' for url, weight in targets)}"
+    )
+    started_at = datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    elapsed = await generate(args, targets, results)
+
+    if args.prom_file:
+        write_prom_file(args.prom_file, results)
+    print(json.dumps(results.summary(started_at, int(elapsed * 1000)), indent=2))
+
+    if runner is not None:
+        if args.linger > 0:
+            logger.info(f"Run complete; serving final metrics for {args.linger:g}s more")
+            await asyncio.sleep(args.linger)
+        await runner.cleanup()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Open-loop load generator for BharatMart endpoints")
+    parser.add_argument(
+        "--target",
+        action="append",
+        help="URL or /path, optionally =weight (repeatable; default LOADGEN_TARGETS, then HEALTH_URLS)",
+    )
+    parser.add_argument("--base-url", default=LOADGEN_BASE_URL, help="Prefix for /path targets")
+    parser.add_argument("--rate", type=float, default=float(os.getenv("LOADGEN_RATE", "10")), help="Requests/s at start")
+    parser.add_argument("--ramp-to", type=float, help="Requests/s at the end (default: constant --rate)")
+    parser.add_argument("--duration", type=float, default=float(os.getenv("LOADGEN_DURATION", "60")), help="Seconds")
+    parser.add_argument("--timeout", type=float, default=REQUEST_TIMEOUT, help="Per-request timeout (REQUEST_TIMEOUT)")
+    parser.add_argument("--max-connections", type=int, default=int(os.getenv("LOADGEN_MAX_CONNECTIONS", "200")))
+    parser.add_argument("--metrics-port", type=int, default=int(os.getenv("LOADGEN_METRICS_PORT", "0")))
+    parser.add_argument("--metrics-host", default=os.getenv("LOADGEN_METRICS_HOST", "127.0.0.1"),
+                        help="Bind address for /metrics (0.0.0.0 exposes it to other hosts)")
+    parser.add_argument("--linger", type=float, default=float(os.getenv("LOADGEN_LINGER_SECONDS", "60")),
+                        help="Keep serving /metrics this long after the run")
+    parser.add_argument("--prom-file", default=os.getenv("LOADGEN_PROM_FILE"), help="Write Prometheus text here too")
+    parser.add_argument("--report-interval", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=1, help="Target selection seed (reproducible mix)")
+    args = parser.parse_args(argv)
+    if args.ramp_to is None:
+        args.ramp_to = float(os.getenv("LOADGEN_RAMP_TO", args.rate))
+    if args.duration <= 0 or args.rate < 0 or args.ramp_to < 0:
+        parser.error("--duration must be > 0 and rates >= 0")
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s", stream=sys.stderr)
+    results = asyncio.run(main_async(args))
+    return 0 if results.summary("", 0)["overall_status"] == "ok" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+bench_archive.py
+
+Write cost and query latency of the local log archive against a plain
+scan of the raw log file (what grepping rotated files by hand amounts to).
+
+Writes --lines api.log lines spread over --hours of event time, in
+shipper-sized batches, to both a raw file and an Archive with small
+segments, then runs the same queries both ways. Batches go through the
+ArchiveWriter thread as in the shipper: the tail-thread cost is the time
+to queue a batch, the writer-thread cost the time spent in Archive.write.
+The queries are:
+
+- a one-minute time window
+- one request id
+- status 503 within ten minutes
+
+Usage:
+    python3 benchmarks/bench_archive.py [--lines 1000000] [--hours 2]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bharatmart_collector.archive import Archive, ArchiveWriter, Query, request_id, status_code  # noqa: E402
+from bharatmart_collector.parser import parse_raw  # noqa: E402
+from bharatmart_collector.timestamps import EventTime  # noqa: E402
+from synthetic import api_log_line  # noqa: E402
+
+
+class TimedArchive(Archive):
+    write_seconds = 0.0
+
+    def write(self, records):
+        started = time.perf_counter()
+        super().write(records)
+        self.write_seconds += time.perf_counter() - started
+
+
+def stamp(dt):
+    return dt.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def scan(path, since, until, request=None, status=None):
+    """
+    Baseline: read every line, filter like the archive query does.
+    """
+    event_time = EventTime("json")
+    found = 0
+    with open(path) as f:
+        for line in f:
+            line = line.rstrip("\n")
+            if request and (request not in line or request_id(line) != request):
+                continue
+            if status and status_code(line) != status:
+                continue
+            if since or until:
+                key = event_time(line)[:19]
+                if (since and key < since) or (until and key > until):
+                    continue
+            found += 1
+    return found
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Archive write cost and query latency")
+    parser.add_argument("--lines", type=int, default=1000000)
+    parser.add_argument("--hours", type=float, default=2.0)
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--segment-mb", type=float, default=16)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    start = datetime(2025, 10, 10, 12, 0, tzinfo=timezone.utc)
+    step = args.hours * 3600 / args.lines
+
+    with tempfile.TemporaryDirectory(prefix="bharatmart-archive-") as workdir:
+        raw_path = os.path.join(workdir, "api.log")
+        archive = TimedArchive(
+            os.path.join(workdir, "archive"),
+            "backend-logs",
+            "json",
+            segment_bytes=int(args.segment_mb * (1 << 20)),
+            max_bytes=1 << 40,
+        )
+
+        writer = ArchiveWriter(archive, max_batches=args.lines // args.batch + 1)
+        queue_seconds = 0.0
+        with open(raw_path, "w") as raw:
+            for first in range(0, args.lines, args.batch):
+                batch = [
+                    parse_raw(api_log_line(i, start.timestamp() + i * step, rng))
+                    for i in range(first, min(first + args.batch, args.lines))
+                ]
+                raw.write("\n".join(record.data for record in batch) + "\n")
+                started = time.perf_counter()
+                writer.write(batch)
+                queue_seconds += time.perf_counter() - started
+        writer.close()
+        assert writer.dropped == 0 and writer.errors == 0
+
+        archive_bytes = sum(
+            os.path.getsize(os.path.join(archive.directory, name))
+            for name in os.listdir(archive.directory)
+        )
+        print(
+            f"raw {os.path.getsize(raw_path) / 1e6:.1f} MB -> archive {archive_bytes / 1e6:.1f} MB "
+            f"(incl. index + blooms); tail thread {queue_seconds / args.lines * 1e9:.0f} ns/line, "
+            f"writer thread {archive.write_seconds / args.lines * 1e9:.0f} ns/line"
+        )
+
+        middle = start + timedelta(hours=args.hours / 2)
+        target = f"req-{args.lines * 2 // 3}"
+        queries = [
+            ("1-minute window", dict(since=stamp(middle), until=stamp(middle + timedelta(seconds=59)))),
+            ("request id", dict(since=None, until=None, request=target)),
+            ("503 in 10 min", dict(since=stamp(middle), until=stamp(middle + timedelta(minutes=10)), status="503")),
+        ]
+
+        print(f"{'query':<16} {'matches':>8} {'scan ms':>9} {'archive ms':>11} {'blocks read':>14}")
+        for name, filters in queries:
+            expected, scan_ms = timed(lambda: scan(raw_path, **filters))
+            query = Query(archive.directory, "backend-logs", **filters)
+            found, archive_ms = timed(lambda: sum(1 for _ in query))
+            assert found == expected, (name, found, expected)
+            stats = query.stats
+            print(
+                f"{name:<16} {found:>8} {scan_ms:>9.1f} {archive_ms:>11.1f} "
+                f"{stats['blocks_read']:>6}/{stats['blocks']:<7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+bench_buffer.py
+
+Memory held per buffered log line while OCI is unavailable, and whether
+the send buffer's ceiling holds.
+
+Each case runs in a fresh process that buffers --lines api.log lines in
+batches of 1000 and reports the RSS growth per line, and that growth
+minus the line's own UTF-8 payload (the overhead; not shown for the
+capped cases, which no longer hold every line):
+
+- records      : batches kept as lists of Record (what an unpacked queue holds)
+- packed       : batches kept as PackedBatch arenas
+- drop_oldest  : SendBuffer in front of a stalled sender, 64 MB ceiling
+- spill        : same, batches beyond the ceiling spilled to a temp dir
+
+Usage:
+    python3 benchmarks/bench_buffer.py [--lines 1000000]
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import threading
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bharatmart_collector.buffer import PackedBatch, SendBuffer  # noqa: E402
+from bharatmart_collector.flow import FlowController  # noqa: E402
+from bharatmart_collector.parser import parse_raw  # noqa: E402
+from bharatmart_collector.telemetry import ShipperTelemetry, process_rss  # noqa: E402
+from synthetic import api_log_line  # noqa: E402
+
+CASES = ("records", "packed", "drop_oldest", "spill")
+BATCH = 1000
+
+
+class StalledSender:
+    """
+    An ingestion outage: no request slot ever frees up.
+    """
+
+    def __init__(self):
+        self.flow = FlowController(concurrency_max=1)
+        self._never = threading.Event()
+
+    def submit(self, records, block=True):
+        if not block:
+            return None
+        self._never.wait()
+
+
+def batches(lines):
+    rng = random.Random(1)
+    now = time.time()
+    offset = 0
+    for start in range(0, lines, BATCH):
+        batch = []
+        for i in range(start, min(start + BATCH, lines)):
+            record = parse_raw(api_log_line(i, now, rng))
+            record.entry_id = f"bench-host-d1f00d-{offset:x}"
+            offset += len(record.data) + 1
+            batch.append(record)
+        yield batch
+
+
+def run_case(case, lines):
+    held = []
+    buffer = None
+    telemetry = ShipperTelemetry("bench", __file__)
+    if case in ("drop_oldest", "spill"):
+        buffer = SendBuffer(
+            StalledSender(),
+            telemetry,
+            "bench",
+            max_bytes=64 << 20,
+            policy=case,
+            spill_dir=tempfile.mkdtemp(prefix="bharatmart-spill-") if case == "spill" else None,
+            spill_max_bytes=4 << 30,
+        )
+
+    payload = 0
+    rss_before = process_rss()
+    started = time.perf_counter()
+    for batch in batches(lines):
+        payload += sum(len(record.data) for record in batch)
+        if case == "records":
+            held.append(batch)
+        elif case == "packed":
+            held.append(PackedBatch(batch))
+        else:
+            buffer.submit(batch)
+    elapsed = time.perf_counter() - started
+    growth = process_rss() - rss_before
+    # Only meaningful when every line is still held in memory
+    overhead = f"{(growth - payload) / lines:.0f}" if buffer is None else "-"
+
+    print(
+        f"{case:<12} {lines:>9} {growth / 1e6:>9.1f} {growth / lines:>9.0f} "
+        f"{overhead:>9} {telemetry.queue_spilled.value:>8} "
+        f"{telemetry.queue_dropped.value:>9} {elapsed:>7.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-line memory of buffered log lines")
+    parser.add_argument("--lines", type=int, default=1000000)
+    parser.add_argument("--case", choices=CASES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.case:
+        run_case(args.case, args.lines)
+        return
+
+    print(
+        f"{'case':<12} {'lines':>9} {'rss MB':>9} {'B/line':>9} {'overhead':>9} "
+        f"{'spilled':>8} {'dropped':>9} {'seconds':>7}"
+    )
+    for case in CASES:
+        subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--lines", str(args.lines), "--case", case],
+            check=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+bench_catchup.py
+
+Backlog replay time with 1 vs N catch-up workers: writes a live api.log
+plus a rotated .gz, runs
+
+    python3 -m bharatmart_collector backend-logs --catch-up-only --catch-up <gz>
+
+against the fake OCI server and reports wall time, lines/s, duplicate
+entry ids (asserted to be zero) and whether every line's id arrived.
+
+Usage:
+    python3 benchmarks/bench_catchup.py [--lines 200000] [--workers 1,4] [--latency-ms 40]
+"""
+
+import os
+import sys
+import gzip
+import time
+import random
+import argparse
+import tempfile
+import subprocess
+
+from fake_oci import add_fault_arguments, from_arguments
+from run_e2e import build_env
+from synthetic import api_log_line
+
+
+def write_backlog(workdir, live_path, lines, gz_fraction=0.25):
+    rng = random.Random(1)
+    now = time.time()
+    rotated = int(lines * gz_fraction)
+    gz_path = os.path.join(workdir, "api.log.1.gz")
+    with gzip.open(gz_path, "wt") as f:
+        for i in range(rotated):
+            f.write(api_log_line(i, now, rng) + "\n")
+    with open(live_path, "w") as f:
+        for i in range(rotated, lines):
+            f.write(api_log_line(i, now, rng) + "\n")
+    return gz_path
+
+
+def run(args, workers):
+    fake = from_arguments(args)
+    fake.track_ids = True
+    fake.start()
+    with tempfile.TemporaryDirectory(prefix="bharatmart-catchup-") as workdir:
+        env = build_env(argparse.Namespace(collector="backend-logs", env=args.env), fake.url, workdir)
+        env.update(
+            CATCHUP_WORKERS=str(workers),
+            CATCHUP_CHUNK_MB=str(args.chunk_mb),
+        )
+        gz_path = write_backlog(workdir, env["BACKEND_LOG_FILE"], args.lines)
+        size = os.path.getsize(env["BACKEND_LOG_FILE"]) + os.path.getsize(gz_path)
+
+        started = time.monotonic()
+        subprocess.run(
+            [sys.executable, "-m", "bharatmart_collector", "backend-logs",
+             "--catch-up-only", "--catch-up", gz_path],
+            cwd=workdir,
+            env=env,
+            check=True,
+            stdout=None if args.verbose else subprocess.DEVNULL,
+            stderr=None if args.verbose else subprocess.DEVNULL,
+        )
+        elapsed = time.monotonic() - started
+    stats = fake.stats()
+    fake.stop()
+
+    accepted = stats["log_entries"]
+    complete = stats["unique_ids"] == args.lines
+    print(
+        f"{workers:>7} {size / 1e6:>8.1f} {accepted:>9} {stats['duplicate_ids']:>10} {elapsed:>8.2f} "
+        f"{accepted / elapsed:>10,.0f} {'yes' if complete else 'NO':>9}"
+    )
+    assert stats["duplicate_ids"] == 0, f"{stats['duplicate_ids']} entry ids arrived more than once"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Catch-up replay time vs workers")
+    parser.add_argument("--lines", type=int, default=200000)
+    parser.add_argument("--workers", default="1,4", help="Comma-separated worker counts")
+    parser.add_argument("--chunk-mb", type=int, default=4)
+    parser.add_argument("--env", action="append", default=[], metavar="KEY=VALUE")
+    parser.add_argument("--verbose", action="store_true")
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    print(
+        f"{'workers':>7} {'MB':>8} {'accepted':>9} {'duplicates':>10} {'seconds':>8} "
+        f"{'lines/s':>10} {'complete':>9}"
+    )
+    for workers in args.workers.split(","):
+        run(args, int(workers))
+
+
+if __name__ == "__main__":
+    main()
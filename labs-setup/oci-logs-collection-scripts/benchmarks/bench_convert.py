@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+bench_convert.py
+
+CPU and memory per scrape cycle of the Prometheus -> OCI conversion.
+
+Compares:
+- legacy : the original convert_prom_to_oci (new dimensions dict, Datapoint,
+           MetricDataDetails and datetime.now() for every sample; O(n^2)
+           histogram _sum lookup)
+- cached : bharatmart_collector.metrics.convert_prom_to_oci with a warm
+           SeriesCache (value/timestamp patch, one timestamp per scrape)
+
+Memory is measured with tracemalloc: "peak KB" is the transient high-water
+mark of one cycle above the pre-cycle baseline.
+
+Usage:
+    python3 benchmarks/bench_convert.py [--series 500] [--cycles 50]
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import tracemalloc
+from datetime import datetime, timezone
+
+import oci
+from prometheus_client.parser import text_string_to_metric_families
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bharatmart_collector.metrics import SeriesCache, convert_prom_to_oci  # noqa: E402
+from bharatmart_collector.routing import Lane, RoutingTable  # noqa: E402
+from synthetic import prometheus_text  # noqa: E402
+
+NAMESPACE = "bharatmart_backend"
+COMPARTMENT = "ocid1.compartment.oc1..bench"
+HOST = "bench-host"
+
+
+def legacy_convert(text_data):
+    MetricDataDetails = oci.monitoring.models.MetricDataDetails
+    Datapoint = oci.monitoring.models.Datapoint
+
+    families = list(text_string_to_metric_families(text_data))
+    metric_payloads = []
+
+    for family in families:
+        sum_map = {}
+        count_map = {}
+        for sample in family.samples:
+            label_key = tuple(sorted(sample.labels.items()))
+            if sample.name.endswith("_sum"):
+                sum_map[label_key] = sample.value
+            elif sample.name.endswith("_count"):
+                count_map[label_key] = sample.value
+
+        for labels, total_sum in sum_map.items():
+            count = count_map.get(labels)
+            if count and count > 0:
+                base_name = None
+                for sample in family.samples:
+                    if sample.name.endswith("_sum") and tuple(
+                        sorted(sample.labels.items())
+                    ) == labels:
+                        base_name = sample.name[:-4]
+                        break
+                if base_name:
+                    dim = dict(labels)
+                    dim["host"] = HOST
+                    metric_payloads.append(
+                        MetricDataDetails(
+                            name=f"{base_name}_avg",
+                            namespace=NAMESPACE,
+                            compartment_id=COMPARTMENT,
+                            dimensions={k: str(v) for k, v in dim.items()},
+                            datapoints=[
+                                Datapoint(
+                                    timestamp=datetime.now(timezone.utc),
+                                    value=float(total_sum / count),
+                                )
+                            ],
+                        )
+                    )
+
+        for sample in family.samples:
+            name = sample.name
+            if name.endswith("_sum") or name.endswith("_count") or name.endswith("_bucket"):
+                continue
+            dimensions = dict(sample.labels)
+            dimensions["host"] = HOST
+            metric_payloads.append(
+                MetricDataDetails(
+                    name=name,
+                    namespace=NAMESPACE,
+                    compartment_id=COMPARTMENT,
+                    dimensions={k: str(v) for k, v in dimensions.items()},
+                    datapoints=[
+                        Datapoint(timestamp=datetime.now(timezone.utc), value=float(sample.value))
+                    ],
+                )
+            )
+    return metric_payloads
+
+
+def measure(name, convert, texts):
+    # Warm-up (fills the series cache for the cached variant)
+    convert(texts[0])
+
+    started = time.perf_counter()
+    for text in texts:
+        streams = len(convert(text))
+    cpu_ms = (time.perf_counter() - started) / len(texts) * 1000
+
+    tracemalloc.start()
+    peaks = []
+    for text in texts[:10]:
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        result = convert(text)
+        peaks.append(tracemalloc.get_traced_memory()[1] - baseline)
+        del result
+    tracemalloc.stop()
+
+    print(
+        f"{name:<8} {streams:>8} {cpu_ms:>10.2f} {sum(peaks) / len(peaks) / 1024:>10.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prometheus -> OCI conversion cost per cycle")
+    parser.add_argument("--series", type=int, default=500)
+    parser.add_argument("--cycles", type=int, default=50)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    texts = [prometheus_text(args.series, i + 1) for i in range(args.cycles)]
+    cache = SeriesCache(HOST)
+    router = RoutingTable(
+        Lane("default", NAMESPACE, COMPARTMENT),
+        [("orders_", Lane("business", "bharatmart_business", COMPARTMENT, flush_interval=5))],
+    )
+
+    def cached_convert(text):
+        return [m for lane_metrics in convert_prom_to_oci(text, router, cache).values() for m in lane_metrics]
+
+    print(f"{'variant':<8} {'streams':>8} {'ms/cycle':>10} {'peak KB':>10}")
+    measure("legacy", legacy_convert, texts)
+    measure("cached", cached_convert, texts)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+bench_diagnostics.py
+
+Measures the cost of debug logging inside the access-log tail loop.
+
+Compares, for the same simulated loop (append line, check batch size):
+- baseline : no logging at all
+- legacy   : per-line logger.debug(f"...") as frontend-access-logs-to-oci.py used to do
+- sampled  : bharatmart_collector.diagnostics.Diagnostics (rate-limited, lazy, summary)
+
+Each variant runs with the logger at INFO (debug filtered) and at DEBUG
+(records emitted to an in-memory stream).
+
+Usage:
+    python3 benchmarks/bench_diagnostics.py [--lines 500000] [--batch 50]
+"""
+
+import io
+import os
+import sys
+import time
+import logging
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bharatmart_collector.diagnostics import Diagnostics  # noqa: E402
+
+LINE = '10.0.0.1 - - [10/Oct/2025:13:55:36 +0000] "GET /api/products HTTP/1.1" 200 512 "-" "curl/8.0"'
+
+
+def make_logger(level):
+    stream = io.StringIO()
+    logger = logging.getLogger(f"bench-{level}")
+    logger.handlers[:] = [logging.StreamHandler(stream)]
+    logger.handlers[0].setFormatter(
+        logging.Formatter("%(asctime)s [%(levelname)s] nginx-access: %(message)s")
+    )
+    logger.setLevel(level)
+    logger.propagate = False
+    return logger, stream
+
+
+def run_baseline(logger, lines, batch_size):
+    buffer = []
+    for _ in range(lines):
+        buffer.append(LINE)
+        if len(buffer) >= batch_size:
+            buffer.clear()
+
+
+def run_legacy(logger, lines, batch_size):
+    buffer = []
+    for _ in range(lines):
+        buffer.append(LINE)
+        logger.debug(f"Buffered line (current batch size={len(buffer)})")
+        if len(buffer) >= batch_size:
+            logger.debug(f"Batch size reached ({batch_size}). Sending...")
+            buffer.clear()
+
+
+def run_sampled(logger, lines, batch_size):
+    diag = Diagnostics(logger, summary_interval=1.0, rate_limit_seconds=1.0)
+    buffer = []
+    for _ in range(lines):
+        buffer.append(LINE)
+        if len(buffer) >= batch_size:
+            diag.debug("batch", "Batch size reached (%d). Sending...", batch_size)
+            diag.count("batches")
+            buffer.clear()
+            diag.tick()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--lines", type=int, default=500_000)
+    parser.add_argument("--batch", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'variant':<10} {'level':<6} {'lines/s':>12} {'ns/line':>9} {'log bytes':>12}")
+    for level in ("INFO", "DEBUG"):
+        for name, fn in (
+            ("baseline", run_baseline),
+            ("legacy", run_legacy),
+            ("sampled", run_sampled),
+        ):
+            logger, stream = make_logger(level)
+            started = time.perf_counter()
+            fn(logger, args.lines, args.batch)
+            elapsed = time.perf_counter() - started
+            print(
+                f"{name:<10} {level:<6} {args.lines / elapsed:>12,.0f} "
+                f"{elapsed / args.lines * 1e9:>9.0f} {len(stream.getvalue()):>12,}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+bench_logmetrics.py
+
+Cost of the access-log metrics stage per line (parse + route normalisation
++ counter/sketch update), for combined and JSON access logs, and the
+accuracy of the DDSketch percentiles against exact ones.
+
+Usage:
+    python3 benchmarks/bench_logmetrics.py [--lines 200000]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bharatmart_collector.logmetrics import AccessLogMetrics, DDSketch  # noqa: E402
+from bharatmart_collector.parser import parse_json, parse_raw  # noqa: E402
+from synthetic import nginx_access_line  # noqa: E402
+
+
+def json_line(seq, ts, rng):
+    return json.dumps(
+        {
+            "remote_addr": f"10.0.0.{seq % 256}",
+            "request_uri": f"/api/products/{rng.randint(1, 5000)}?bench_ts={ts:.6f}",
+            "status": rng.choice([200] * 95 + [404, 500, 503]),
+            "body_bytes_sent": rng.randint(200, 20000),
+            "request_time": round(rng.expovariate(1 / 0.04), 3),
+            "upstream_addr": "127.0.0.1:3000",
+        }
+    )
+
+
+def measure(name, lines, parser):
+    metrics = AccessLogMetrics(None, "bench", "ocid1.compartment.oc1..bench", "bench-host")
+    records = [parser(line) for line in lines]
+
+    started = time.perf_counter()
+    for record in records:
+        metrics.observe(record)
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"{name:<10} {len(lines) / elapsed:>12,.0f} {elapsed / len(lines) * 1e9:>10.0f} "
+        f"{len(metrics._stats):>6} {metrics.unparsed:>9}"
+    )
+
+
+def accuracy(count, rng):
+    values = [rng.expovariate(1 / 0.04) for _ in range(count)]
+    sketch = DDSketch()
+    for v in values:
+        sketch.add(v)
+    values.sort()
+    print(f"\n{'quantile':<8} {'exact ms':>10} {'sketch ms':>10} {'rel err':>8}")
+    for q in (0.5, 0.9, 0.99, 0.999):
+        exact = values[int(q * (count - 1))]
+        approx = sketch.quantile(q)
+        print(f"p{q * 100:<7g} {exact * 1000:>10.2f} {approx * 1000:>10.2f} {abs(approx - exact) / exact:>8.2%}")
+    print(f"sketch bins: {len(sketch.bins)} for {count} values")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Access-log metrics stage cost")
+    parser.add_argument("--lines", type=int, default=200000)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    now = time.time()
+    combined = [nginx_access_line(i, now, rng) for i in range(args.lines)]
+    json_lines = [json_line(i, now, rng) for i in range(args.lines)]
+
+    print(f"{'format':<10} {'lines/s':>12} {'ns/line':>10} {'keys':>6} {'unparsed':>9}")
+    measure("combined", combined, parse_raw)
+    measure("json", json_lines, parse_raw)
+    measure("json+fld", json_lines, parse_json)  # fields already decoded by --parser json
+
+    accuracy(args.lines, rng)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+bench_reduce.py
+
+Volume reduction and per-line cost of the Reducer stage on a backend
+retry storm (a fraction of api.log lines replaced by the same error with
+varying request ids / timestamps) and on sampled NGINX access lines.
+
+Usage:
+    python3 benchmarks/bench_reduce.py [--lines 200000] [--storm 0.5]
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bharatmart_collector.parser import parse_raw  # noqa: E402
+from bharatmart_collector.reduce import Reducer, parse_sample_rates  # noqa: E402
+from bharatmart_collector.telemetry import ShipperTelemetry  # noqa: E402
+from synthetic import api_log_line, nginx_access_line  # noqa: E402
+
+
+def storm_line(seq, ts, rng):
+    return json.dumps(
+        {
+            "time": datetime.fromtimestamp(ts, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": "error",
+            "msg": "payment gateway timeout, retrying",
+            "attempt": rng.randint(1, 5),
+            "request_id": f"req-{seq}",
+            "upstream": "10.0.3.17:8443",
+        }
+    )
+
+
+def run(name, lines, **reducer_args):
+    telemetry = ShipperTelemetry(name, __file__)
+    reducer = Reducer(telemetry, **reducer_args)
+    records = [parse_raw(line) for line in lines]
+
+    shipped = 0
+    started = time.perf_counter()
+    for record in records:
+        if reducer(record) is not None:
+            shipped += 1
+        if reducer.expire_due:
+            shipped += len(reducer.expire())
+    shipped += len(reducer.expire(force=True))
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"{name:<14} {len(lines):>9} {shipped:>9} {1 - shipped / len(lines):>8.1%} "
+        f"{elapsed / len(lines) * 1e9:>8.0f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reducer volume and cost")
+    parser.add_argument("--lines", type=int, default=200000)
+    parser.add_argument("--storm", type=float, default=0.5, help="Fraction of storm lines")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    now = time.time()
+    backend = [
+        storm_line(i, now, rng) if rng.random() < args.storm else api_log_line(i, now, rng)
+        for i in range(args.lines)
+    ]
+    access = [nginx_access_line(i, now, rng) for i in range(args.lines)]
+
+    print(f"{'case':<14} {'lines in':>9} {'shipped':>9} {'reduced':>8} {'ns/line':>8}")
+    run("backend-off", backend, dedup="off")
+    run("backend-errors", backend, dedup="errors")
+    run("access-off", access, dedup="off")
+    run("access-2xx=0.1", access, sample_rates=parse_sample_rates("2xx=0.1"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+fake_oci.py
+
+Local stand-in for OCI Logging ingestion and Monitoring telemetry
+ingestion, plus a fake Prometheus /metrics endpoint.
+
+Endpoints:
+- POST /20200831/logs/{logId}/actions/push  (LoggingClient.put_logs)
+- POST /20180401/metrics                    (MonitoringClient.post_metric_data)
+- GET  /metrics                             (synthetic Prometheus exposition)
+- GET  /stats                               (JSON counters and latency percentiles)
+
+Fault injection:
+- latency_ms / jitter_ms : added to every ingestion request
+- error_rate             : fraction answered with 500
+- throttle_rate          : fraction answered with 429 + Retry-After
+- max_rps                : token bucket; requests above it get 429
+
+Point a collector at it with OCI_LOGGING_ENDPOINT / OCI_TELEMETRY_ENDPOINT
+(any OCI config with a syntactically valid key works; signatures are not
+checked). Standalone:
+
+    python3 benchmarks/fake_oci.py --port 8080 --latency-ms 40 --throttle-rate 0.05
+"""
+
+import re
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from synthetic import prometheus_text
+
+BENCH_TS = re.compile(r"bench_ts[\"=:\s]+([0-9]+\.[0-9]+)")
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return None
+    index = min(int(q / 100.0 * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+class FakeOci:
+    def __init__(
+        self,
+        latency_ms=0.0,
+        jitter_ms=0.0,
+        error_rate=0.0,
+        throttle_rate=0.0,
+        retry_after=1,
+        max_rps=0,
+        series=200,
+        seed=1,
+        track_ids=False,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.max_rps = max_rps
+        self.series = series
+        self.track_ids = track_ids  # remember accepted entry ids to count duplicates
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.server = None
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.requests = {}
+            self.log_entries = 0
+            self.entry_ids = set()
+            self.duplicate_ids = 0
+            self.metric_streams = 0
+            self.bytes_received = 0
+            self.scrapes = 0
+            self.e2e_latencies = []
+            self.first_accept = None
+            self.last_accept = None
+            self._tokens = float(self.max_rps)
+            self._tokens_at = time.monotonic()
+
+    # ---------------------------------------------------
+    # Fault injection
+    # ---------------------------------------------------
+    def _admit(self):
+        """
+        Returns None to accept, or (status, code) to reject.
+        """
+        with self.lock:
+            if self.max_rps:
+                now = time.monotonic()
+                self._tokens = min(
+                    float(self.max_rps), self._tokens + (now - self._tokens_at) * self.max_rps
+                )
+                self._tokens_at = now
+                if self._tokens < 1:
+                    return 429, "TooManyRequests"
+                self._tokens -= 1
+            roll = self.rng.random()
+        if roll < self.throttle_rate:
+            return 429, "TooManyRequests"
+        if roll < self.throttle_rate + self.error_rate:
+            return 500, "InternalServerError"
+        return None
+
+    def _delay(self):
+        delay = self.latency_ms + (self.rng.random() * self.jitter_ms if self.jitter_ms else 0)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+
+    # ---------------------------------------------------
+    # Accounting
+    # ---------------------------------------------------
+    def _count(self, status):
+        with self.lock:
+            self.requests[status] = self.requests.get(status, 0) + 1
+
+    def accept_logs(self, body):
+        now = time.time()
+        latencies = []
+        entries = 0
+        ids = []
+        for batch in body.get("logEntryBatches", []):
+            for entry in batch.get("entries", []):
+                entries += 1
+                if self.track_ids:
+                    ids.append(entry.get("id"))
+                match = BENCH_TS.search(entry.get("data", ""))
+                if match:
+                    latencies.append(now - float(match.group(1)))
+        with self.lock:
+            self.log_entries += entries
+            for entry_id in ids:
+                if entry_id in self.entry_ids:
+                    self.duplicate_ids += 1
+                else:
+                    self.entry_ids.add(entry_id)
+            self.e2e_latencies.extend(latencies)
+            self.first_accept = self.first_accept or now
+            self.last_accept = now
+
+    def accept_metrics(self, body):
+        now = time.time()
+        with self.lock:
+            self.metric_streams += len(body.get("metricData", []))
+            self.first_accept = self.first_accept or now
+            self.last_accept = now
+
+    def stats(self):
+        with self.lock:
+            latencies = sorted(self.e2e_latencies)
+            return {
+                "requests": {str(k): v for k, v in sorted(self.requests.items())},
+                "log_entries": self.log_entries,
+                "unique_ids": len(self.entry_ids),
+                "duplicate_ids": self.duplicate_ids,
+                "metric_streams": self.metric_streams,
+                "bytes_received": self.bytes_received,
+                "scrapes": self.scrapes,
+                "e2e_latency_ms": {
+                    f"p{q}": round(percentile(latencies, q) * 1000, 2) if latencies else None
+                    for q in (50, 90, 99, 99.9)
+                },
+                "first_accept": self.first_accept,
+                "last_accept": self.last_accept,
+            }
+
+    # ---------------------------------------------------
+    # HTTP
+    # ---------------------------------------------------
+    def start(self, host="127.0.0.1", port=0):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _reply(self, status, payload=None, headers=None):
+                body = json.dumps(payload).encode() if payload is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.send_header("opc-request-id", f"bench-{time.monotonic_ns()}")
+                for k, v in (headers or {}).items():
+                    self.send_header(k, v)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                if path == "/metrics":
+                    with fake.lock:
+                        fake.scrapes += 1
+                        scrape_no = fake.scrapes
+                    body = prometheus_text(fake.series, scrape_no).encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                elif path == "/stats":
+                    self._reply(200, fake.stats())
+                else:
+                    self._reply(404, {"code": "NotFound", "message": path})
+
+            def do_POST(self):
+                raw = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                with fake.lock:
+                    fake.bytes_received += len(raw)
+
+                if self.path == "/reset":
+                    fake.reset()
+                    self._reply(200, {})
+                    return
+
+                fake._delay()
+                rejection = fake._admit()
+                if rejection:
+                    status, code = rejection
+                    fake._count(status)
+                    headers = {"Retry-After": str(fake.retry_after)} if status == 429 else None
+                    self._reply(status, {"code": code, "message": "injected by fake_oci"}, headers)
+                    return
+
+                body = json.loads(raw or b"{}")
+                if self.path.endswith("/actions/push"):
+                    fake.accept_logs(body)
+                    fake._count(200)
+                    self._reply(200)
+                elif self.path.endswith("/metrics"):
+                    fake.accept_metrics(body)
+                    fake._count(200)
+                    self._reply(200, {"failedMetricsCount": 0, "failedMetrics": []})
+                else:
+                    fake._count(404)
+                    self._reply(404, {"code": "NotFound", "message": self.path})
+
+            def log_message(self, fmt, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self.server
+
+    @property
+    def url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def stop(self):
+        if self.server is not None:
+            self.server.shutdown()
+
+
+def add_fault_arguments(parser):
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--max-rps", type=float, default=0)
+    parser.add_argument("--series", type=int, default=200, help="Streams served on /metrics")
+
+
+def from_arguments(args):
+    return FakeOci(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        retry_after=args.retry_after,
+        max_rps=args.max_rps,
+        series=args.series,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local OCI ingestion stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    fake = from_arguments(args)
+    fake.start(args.host, args.port)
+    print(f"Fake OCI listening on {fake.url} (GET /stats for counters)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        fake.stop()
+
+
+if __name__ == "__main__":
+    main()
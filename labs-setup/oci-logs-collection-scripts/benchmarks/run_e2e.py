@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+run_e2e.py
+
+End-to-end throughput benchmark for the collectors.
+
+Starts the fake OCI server (benchmarks/fake_oci.py), runs the real
+collector as a subprocess (python3 -m bharatmart_collector <collector>)
+pointed at it, drives synthetic traffic and reports:
+
+- throughput (log lines/s or metric streams/s accepted by the fake)
+- end-to-end latency percentiles (line written -> batch accepted)
+- collector CPU seconds / CPU % and peak RSS (from /proc, Linux only)
+- HTTP status mix seen by the fake (retries, throttling)
+
+Examples:
+    python3 benchmarks/run_e2e.py backend-logs --rate 5000 --duration 20
+    python3 benchmarks/run_e2e.py nginx-access --rate 20000 --latency-ms 50 --throttle-rate 0.05
+    python3 benchmarks/run_e2e.py backend-metrics --series 500 --duration 30 --env SCRAPE_INTERVAL_SECONDS=1
+    python3 benchmarks/run_e2e.py backend-logs --json results/baseline.json --env LOG_BATCH_SIZE=200
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from fake_oci import add_fault_arguments, from_arguments
+from synthetic import LineWriter
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+SCRIPTS_DIR = os.path.dirname(BENCH_DIR)
+
+LOG_ENV = {
+    "backend-logs": ("BACKEND_LOG_FILE", "BACKEND_LOG_OCID"),
+    "nginx-access": ("NGINX_ACCESS_LOG_FILE", "NGINX_ACCESS_LOG_OCID"),
+    "nginx-error": ("NGINX_ERROR_LOG_FILE", "NGINX_ERROR_LOG_OCID"),
+}
+
+CLK_TCK = os.sysconf("SC_CLK_TCK")
+
+
+# -------------------------------------------------------
+# Throwaway OCI config (signatures are not verified)
+# -------------------------------------------------------
+def write_oci_config(workdir):
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    key_path = os.path.join(workdir, "bench_key.pem")
+    with open(key_path, "wb") as f:
+        f.write(
+            key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.TraditionalOpenSSL,
+                serialization.NoEncryption(),
+            )
+        )
+
+    config_path = os.path.join(workdir, "oci_config")
+    with open(config_path, "w") as f:
+        f.write(
+            "[DEFAULT]\n"
+            "user=ocid1.user.oc1..bench\n"
+            "fingerprint=00:00:00:00:00:00:00:00:00:00:00:00:00:00:00:00\n"
+            "tenancy=ocid1.tenancy.oc1..bench\n"
+            "region=bench-region-1\n"
+            f"key_file={key_path}\n"
+        )
+    return config_path
+
+
+# -------------------------------------------------------
+# /proc sampling
+# -------------------------------------------------------
+def cpu_seconds(pid):
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(")", 1)[1].split()
+    # utime, stime are fields 14 and 15; index 11/12 after the comm field
+    return (int(fields[11]) + int(fields[12])) / CLK_TCK
+
+
+def rss_kb(pid, field="VmRSS"):
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1])
+    return 0
+
+
+# -------------------------------------------------------
+# Run
+# -------------------------------------------------------
+def build_env(args, fake_url, workdir):
+    """
+    Collector environment for a run. The lab .env is not loaded and every
+    setting that writes state or changes what is shipped is pinned, so a
+    bench run never touches the real checkpoint or archive.
+    """
+    env = dict(os.environ)
+    env.update(
+        BHARATMART_SKIP_DOTENV="1",
+        PYTHONPATH=SCRIPTS_DIR + os.pathsep + env.get("PYTHONPATH", ""),
+        OCI_AUTH="config_file",
+        OCI_CONFIG_FILE=write_oci_config(workdir),
+        OCI_PROFILE="DEFAULT",
+        OCI_REGION="bench-region-1",
+        OCI_LOGGING_ENDPOINT=fake_url,
+        OCI_TELEMETRY_ENDPOINT=fake_url,
+        COMPARTMENT_OCID="ocid1.compartment.oc1..bench",
+        BACKEND_METRICS_ENDPOINT=f"{fake_url}/metrics",
+        LOG_LEVEL="WARNING",
+        DIAG_SUMMARY_INTERVAL_SECONDS="0",
+        BACKEND_LOGS_TELEMETRY_PORT="0",
+        NGINX_ACCESS_TELEMETRY_PORT="0",
+        NGINX_ERROR_TELEMETRY_PORT="0",
+        BACKEND_METRICS_TELEMETRY_PORT="0",
+        PUSH_SELF_TELEMETRY="false",
+        LOG_CHECKPOINT_DIR=os.path.join(workdir, "checkpoints"),
+        ARCHIVE_DIR="",
+        ACCESS_LOG_METRICS="false",
+        LOG_DEDUP="",
+        ACCESS_LOG_SAMPLE_RATES="",
+        LOG_SPILL_DIR="",
+        SECRET_CACHE_FILE="",
+        BACKEND_METRICS_TOKEN_SECRET_OCID="",
+    )
+
+    if args.collector in LOG_ENV:
+        file_env, ocid_env = LOG_ENV[args.collector]
+        log_path = os.path.join(workdir, f"{args.collector}.log")
+        open(log_path, "w").close()
+        env[file_env] = log_path
+        env[ocid_env] = "ocid1.log.oc1..bench"
+
+    for item in args.env:
+        key, _, value = item.partition("=")
+        env[key] = value
+    return env
+
+
+def wait_for(predicate, timeout, step=0.2):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(step)
+    return predicate()
+
+
+def run(args):
+    fake = from_arguments(args)
+    fake.start()
+
+    with tempfile.TemporaryDirectory(prefix="bharatmart-bench-") as workdir:
+        env = build_env(args, fake.url, workdir)
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "bharatmart_collector", args.collector],
+            cwd=workdir,
+            env=env,
+            stdout=None if args.verbose else subprocess.DEVNULL,
+            stderr=None if args.verbose else subprocess.DEVNULL,
+        )
+        try:
+            time.sleep(args.warmup)
+            if proc.poll() is not None:
+                raise RuntimeError(f"{args.collector} exited early with code {proc.returncode}")
+
+            fake.reset()
+            cpu_start = cpu_seconds(proc.pid)
+            started = time.time()
+            peak_rss = 0
+
+            writer = None
+            if args.collector in LOG_ENV:
+                log_path = env[LOG_ENV[args.collector][0]]
+                writer = LineWriter(log_path, args.collector, args.rate, args.duration)
+                writer.start()
+
+            while time.time() - started < args.duration:
+                peak_rss = max(peak_rss, rss_kb(proc.pid))
+                time.sleep(0.5)
+            during_load = fake.stats()
+
+            if writer is not None:
+                writer.join()
+                # Drain: wait until everything written has been accepted
+                drained = wait_for(
+                    lambda: fake.stats()["log_entries"] >= writer.written, args.drain_timeout
+                )
+            else:
+                drained = True
+
+            wall = time.time() - started
+            cpu = cpu_seconds(proc.pid) - cpu_start
+            peak_rss = max(peak_rss, rss_kb(proc.pid, "VmHWM"))
+        finally:
+            proc.terminate()
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+
+    stats = fake.stats()
+    fake.stop()
+
+    key = "log_entries" if writer is not None else "metric_streams"
+    accepted = stats[key]
+    return {
+        "collector": args.collector,
+        "offered_rate": args.rate if writer is not None else None,
+        "written": writer.written if writer is not None else None,
+        "accepted": accepted,
+        "drained": drained,
+        # Accepted while load was applied; the drain tail is excluded
+        "throughput_per_s": round(during_load[key] / args.duration, 1),
+        "wall_seconds": round(wall, 2),
+        "cpu_seconds": round(cpu, 2),
+        "cpu_percent": round(100.0 * cpu / wall, 1),
+        "peak_rss_mb": round(peak_rss / 1024.0, 1),
+        "e2e_latency_ms": stats["e2e_latency_ms"],
+        "metric_streams": stats["metric_streams"],
+        "requests": stats["requests"],
+        "scrapes": stats["scrapes"],
+        "faults": {
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "error_rate": args.error_rate,
+            "throttle_rate": args.throttle_rate,
+            "max_rps": args.max_rps,
+        },
+        "env": args.env,
+    }
+
+
+def print_report(result):
+    unit = "lines/s" if result["written"] is not None else "streams/s"
+    print(f"collector        : {result['collector']}")
+    if result["written"] is not None:
+        print(f"offered          : {result['offered_rate']} lines/s, {result['written']} written")
+    print(f"accepted         : {result['accepted']} (drained={result['drained']})")
+    print(f"throughput       : {result['throughput_per_s']} {unit}")
+    latency = result["e2e_latency_ms"]
+    if latency["p50"] is not None:
+        print(
+            "e2e latency (ms) : "
+            + "  ".join(f"{k}={v}" for k, v in latency.items())
+        )
+    print(f"cpu              : {result['cpu_seconds']}s ({result['cpu_percent']}%)")
+    print(f"peak rss         : {result['peak_rss_mb']} MB")
+    print(f"http statuses    : {result['requests']}")
+    if result["written"] is not None and result["metric_streams"]:
+        print(f"metric streams   : {result['metric_streams']} (log-derived metrics)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end collector benchmark")
+    parser.add_argument(
+        "collector", choices=["backend-logs", "nginx-access", "nginx-error", "backend-metrics"]
+    )
+    parser.add_argument("--rate", type=float, default=2000, help="Log lines per second")
+    parser.add_argument("--duration", type=float, default=15, help="Seconds of load")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Seconds to let the collector start")
+    parser.add_argument("--drain-timeout", type=float, default=30.0)
+    parser.add_argument(
+        "--env", action="append", default=[], metavar="KEY=VALUE",
+        help="Extra environment for the collector (repeatable)",
+    )
+    parser.add_argument("--json", help="Write the result as JSON to this path")
+    parser.add_argument("--verbose", action="store_true", help="Show collector output")
+    add_fault_arguments(parser)
+    args = parser.parse_args()
+
+    result = run(args)
+    print_report(result)
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
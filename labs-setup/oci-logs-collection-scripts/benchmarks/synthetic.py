@@ -0,0 +1,145 @@
+"""
+synthetic.py
+
+Synthetic BharatMart traffic for the benchmarks.
+
+- api_log_line       : backend api.log JSON line
+- nginx_access_line  : NGINX combined access log line + $request_time $upstream_addr
+- nginx_error_line   : NGINX error log line
+- prometheus_text    : /metrics exposition with a configurable series count
+- LineWriter         : open-loop writer appending lines at a fixed rate
+
+Every log line carries a bench_ts=<epoch seconds> marker written at
+generation time, which the fake OCI server uses to compute end-to-end
+latency.
+"""
+
+import json
+import time
+import random
+import threading
+from datetime import datetime, timezone
+
+ROUTES = ["/api/products", "/api/products/42", "/api/cart", "/api/orders", "/api/health"]
+METHODS = ["GET", "GET", "GET", "POST"]
+STATUSES = [200] * 90 + [201] * 4 + [404] * 3 + [500] * 2 + [503]
+AGENTS = ["curl/8.0", "Mozilla/5.0 (X11; Linux x86_64)", "k6/0.49"]
+
+
+def api_log_line(seq, ts, rng=random):
+    status = rng.choice(STATUSES)
+    return json.dumps(
+        {
+            "time": datetime.fromtimestamp(ts, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": "error" if status >= 500 else "info",
+            "msg": "request failed" if status >= 500 else "request completed",
+            "method": rng.choice(METHODS),
+            "path": rng.choice(ROUTES),
+            "status": status,
+            "duration_ms": round(rng.expovariate(1 / 40.0), 2),
+            "request_id": f"req-{seq}",
+            "bench_ts": round(ts, 6),
+        }
+    )
+
+
+def nginx_access_line(seq, ts, rng=random):
+    stamp = datetime.fromtimestamp(ts, timezone.utc).strftime("%d/%b/%Y:%H:%M:%S +0000")
+    return (
+        f"10.0.{seq % 256}.{rng.randint(1, 254)} - - [{stamp}] "
+        f'"{rng.choice(METHODS)} {rng.choice(ROUTES)}?bench_ts={ts:.6f} HTTP/1.1" '
+        f'{rng.choice(STATUSES)} {rng.randint(200, 20000)} "-" "{rng.choice(AGENTS)}" '
+        f"{rng.expovariate(1 / 0.04):.3f} 127.0.0.1:3000"
+    )
+
+
+def nginx_error_line(seq, ts, rng=random):
+    stamp = datetime.fromtimestamp(ts, timezone.utc).strftime("%Y/%m/%d %H:%M:%S")
+    return (
+        f"{stamp} [error] 1234#1234: *{seq} connect() failed (111: Connection refused) "
+        f"while connecting to upstream, client: 10.0.0.{seq % 256}, server: _, "
+        f'request: "GET {rng.choice(ROUTES)}?bench_ts={ts:.6f} HTTP/1.1", '
+        f'upstream: "http://127.0.0.1:3000/api/products"'
+    )
+
+
+LINE_GENERATORS = {
+    "backend-logs": api_log_line,
+    "nginx-access": nginx_access_line,
+    "nginx-error": nginx_error_line,
+}
+
+
+def prometheus_text(series, scrape_no, rng=random):
+    """
+    Exposition shaped like the BharatMart backend: a request counter and a
+    latency histogram per route/status, gauges, and business counters.
+    series is the approximate number of OCI streams it converts to.
+    """
+    lines = [
+        "# HELP http_requests_total Total HTTP requests",
+        "# TYPE http_requests_total counter",
+    ]
+    per_family = max(series // 3, 1)
+    for i in range(per_family):
+        lines.append(
+            f'http_requests_total{{route="/api/r{i}",status="200"}} {scrape_no * (i + 1)}'
+        )
+
+    lines += [
+        "# HELP http_request_duration_seconds Request latency",
+        "# TYPE http_request_duration_seconds histogram",
+    ]
+    for i in range(per_family):
+        labels = f'route="/api/r{i}"'
+        count = scrape_no * 10 + i
+        for le in ("0.05", "0.1", "0.5", "+Inf"):
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{le}"}} {count}')
+        lines.append(f"http_request_duration_seconds_sum{{{labels}}} {count * 0.04:.3f}")
+        lines.append(f"http_request_duration_seconds_count{{{labels}}} {count}")
+
+    lines += ["# HELP process_open_fds Open fds", "# TYPE process_open_fds gauge"]
+    for i in range(max(series - 2 * per_family - 1, 0)):
+        lines.append(f'process_open_fds{{worker="{i}"}} {rng.randint(10, 20)}')
+
+    lines += [
+        "# HELP orders_created_total Orders created",
+        "# TYPE orders_created_total counter",
+        f"orders_created_total {scrape_no * 3}",
+    ]
+    return "\n".join(lines) + "\n"
+
+
+class LineWriter(threading.Thread):
+    """
+    Open-loop writer: appends lines at `rate` per second for `duration`
+    seconds regardless of how fast the shipper consumes them.
+    """
+
+    def __init__(self, path, kind, rate, duration, tick=0.01, seed=1):
+        super().__init__(daemon=True)
+        self.path = path
+        self.generate = LINE_GENERATORS[kind]
+        self.rate = rate
+        self.duration = duration
+        self.tick = tick
+        self.rng = random.Random(seed)
+        self.written = 0
+
+    def run(self):
+        started = time.time()
+        with open(self.path, "a") as f:
+            while True:
+                now = time.time()
+                elapsed = now - started
+                if elapsed >= self.duration:
+                    break
+                due = int(self.rate * elapsed) - self.written
+                if due > 0:
+                    chunk = [
+                        self.generate(self.written + i, now, self.rng) for i in range(due)
+                    ]
+                    f.write("\n".join(chunk) + "\n")
+                    f.flush()
+                    self.written += due
+                time.sleep(self.tick)
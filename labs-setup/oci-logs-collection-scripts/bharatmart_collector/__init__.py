@@ -0,0 +1,14 @@
+"""
+bharatmart_collector
+
+Shared building blocks for the BharatMart log shippers and metrics
+collector. A log shipper is a pipeline of pluggable stages:
+
+    reader.FileTailer -> parser.PARSERS[...] -> batcher.Batcher -> sender.LogSender
+
+wired together by shipper.LogShipper. metrics.MetricsCollector scrapes
+Prometheus and sends through sender.MetricSender. Authentication and client
+bootstrap live in auth.OciAuth; cli.main is the single entry point.
+
+Author: BharatMart Observability
+"""
@@ -0,0 +1,490 @@
+"""
+bharatmart_collector/archive.py
+
+Local, time-indexed archive of shipped log lines for postmortem timelines.
+
+Features:
+- Every shipped batch is appended to the current segment as one
+  independently zlib-compressed block
+- Sparse time index: one line per block in <segment>.idx with its byte
+  range, line count and earliest/latest event second of its lines, so a
+  time-range query only decompresses the blocks that overlap the range
+- Per-segment bloom filter on request ids and HTTP status codes
+  (<segment>.bloom, written when the segment is sealed, or rebuilt on
+  startup for a segment a previous run left unsealed); a query for a
+  request id or a rare status skips segments that cannot contain it
+- Segments are sealed by size or age; the oldest are deleted once all
+  their files (.seg, .idx, .bloom) exceed ARCHIVE_MAX_MB
+- Written on a dedicated thread (ArchiveWriter): the shipper only queues
+  the batch, so compression and disk I/O never stall the tail loop
+
+Query:
+    python3 -m bharatmart_collector.archive --dir /var/lib/bharatmart-collector/archive \\
+        backend-logs --since 2025-10-10T13:50 --until 2025-10-10T14:05 --status 502
+    python3 -m bharatmart_collector.archive --dir ... nginx-access --since 30m --request-id req-81f3
+
+Configuration (.env):
+    ARCHIVE_DIR=/var/lib/bharatmart-collector/archive
+    ARCHIVE_SEGMENT_MB=64
+    ARCHIVE_SEGMENT_SECONDS=3600
+    ARCHIVE_MAX_MB=2048
+
+Author: BharatMart Observability
+"""
+
+import os
+import re
+import sys
+import glob
+import json
+import time
+import zlib
+import queue
+import hashlib
+import logging
+import argparse
+import threading
+from datetime import datetime, timedelta, timezone
+
+from .config import env_str, load_env
+from .timestamps import EventTime
+
+logger = logging.getLogger(__name__)
+
+COMPRESS_LEVEL = 1
+# ~13 bits per 200-byte line and 4 hashes: ~0.5% false positives
+BLOOM_HASHES = 4
+BLOOM_BITS_PER_BYTE = 1 / 16  # bloom bits per uncompressed segment byte
+SEGMENT_SUFFIXES = (".seg", ".idx", ".bloom")
+
+REQUEST_ID_KEYS = ('"request_id"', '"requestId"', '"req_id"', " request_id=", " rid=")
+JSON_VALUE = re.compile(r'\s*:\s*"([\w.:-]+)"')
+KV_VALUE = re.compile(r"[\w.:-]+")
+JSON_STATUS = re.compile(r'"(?:status|statusCode|status_code)"\s*:\s*"?(\d{3})\b')
+
+
+# -------------------------------------------------------
+# Field extraction
+# -------------------------------------------------------
+def request_id(line):
+    # Substring search first; a regex over the whole line is ~10x slower
+    for key in REQUEST_ID_KEYS:
+        i = line.find(key)
+        if i >= 0:
+            break
+    else:
+        return None
+    i += len(key)
+    if key[0] == '"':
+        match = JSON_VALUE.match(line, i)
+        return match.group(1) if match else None
+    match = KV_VALUE.match(line, i)
+    return match.group(0) if match else None
+
+
+def status_code(line):
+    if line[:1] == "{":
+        match = JSON_STATUS.search(line)
+        return match.group(1) if match else None
+    parts = line.split('"', 3)  # NGINX: status follows the quoted request
+    if len(parts) < 3:
+        return None
+    status = parts[2][:5].strip()[:3]
+    return status if status.isdigit() else None
+
+
+def time_key(value):
+    """
+    --since/--until value -> "YYYY-MM-DDTHH:MM:SS" in UTC. Accepts ISO 8601
+    (naive = UTC) or a duration before now: 90s, 15m, 2h, 1d.
+    """
+    units = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+    if value[-1:] in units and value[:-1].isdigit():
+        dt = datetime.now(timezone.utc) - timedelta(seconds=int(value[:-1]) * units[value[-1]])
+    else:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if dt.tzinfo is not None:
+            dt = dt.astimezone(timezone.utc)
+    return dt.strftime("%Y-%m-%dT%H:%M:%S")
+
+
+# -------------------------------------------------------
+# Bloom filter
+# -------------------------------------------------------
+class Bloom:
+    def __init__(self, bits, hashes=BLOOM_HASHES, data=None):
+        self.bits = bits
+        self.hashes = hashes
+        self.data = data if data is not None else bytearray((bits + 7) // 8)
+
+    def _positions(self, key):
+        # Double hashing over one 64-bit digest (stable across processes,
+        # unlike hash(); CRC32 pairs are linear and collide on similar ids)
+        digest = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "little")
+        h1 = digest & 0xFFFFFFFF
+        h2 = (digest >> 32) | 1
+        bits = self.bits
+        return [(h1 + i * h2) % bits for i in range(self.hashes)]
+
+    def add(self, key):
+        data = self.data
+        for pos in self._positions(key):
+            data[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key):
+        data = self.data
+        return all(data[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(f"{self.bits} {self.hashes}\n".encode())
+            f.write(self.data)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            header = f.readline().split()
+            return cls(int(header[0]), int(header[1]), bytearray(f.read()))
+
+
+# -------------------------------------------------------
+# Writer (shipper side)
+# -------------------------------------------------------
+class Archive:
+    def __init__(
+        self,
+        directory,
+        name,
+        time_format,
+        telemetry=None,
+        segment_bytes=64 << 20,
+        segment_seconds=3600.0,
+        max_bytes=2 << 30,
+    ):
+        self.directory = directory
+        self.name = name
+        self.telemetry = telemetry
+        self.segment_bytes = segment_bytes
+        self.segment_seconds = segment_seconds
+        self.max_bytes = max_bytes
+        self.event_time = EventTime(time_format)
+
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"{name}.meta.json"), "w") as f:
+            json.dump({"time_format": time_format}, f)
+
+        existing = segments(directory, name)
+        for path in existing:
+            if not os.path.exists(f"{path[:-4]}.bloom"):
+                self._rebuild_bloom(path)
+        # Never append to a segment left by a previous run (it may end mid-block)
+        self._seq = int(existing[-1][-12:-4]) if existing else 0
+        self._open_segment()
+
+    def _new_bloom(self):
+        return Bloom(max(1 << 16, int(self.segment_bytes * BLOOM_BITS_PER_BYTE)))
+
+    def _rebuild_bloom(self, path):
+        """
+        Seal a segment left unsealed by a previous run (no .bloom yet).
+        """
+        bloom = self._new_bloom()
+        with open(path, "rb") as f:
+            for offset, length, _, _, _ in read_index(path):
+                f.seek(offset)
+                try:
+                    lines = zlib.decompress(f.read(length)).decode().split("\n")
+                except zlib.error:
+                    continue  # torn block at a crash
+                self._add_keys(bloom, lines)
+        bloom.save(f"{path[:-4]}.bloom")
+        logger.info(f"Archive: rebuilt bloom filter of unsealed {path}")
+
+    def _open_segment(self):
+        self._seq += 1
+        self.path = os.path.join(self.directory, f"{self.name}-{self._seq:08d}.seg")
+        self._data = open(self.path, "ab")
+        self._index = open(f"{self.path[:-4]}.idx", "a")
+        self._raw_bytes = 0
+        self._opened_at = time.monotonic()
+        self._bloom = self._new_bloom()
+
+    def write(self, records):
+        """
+        Append one shipped batch as a block.
+        """
+        if not records:
+            return
+        lines = [record.data for record in records]
+        self._add_keys(self._bloom, lines)
+
+        # Every line: repeat summaries keep their first copy's time and late
+        # lines arrive out of order, so first/last lines do not bound a block
+        stamps = [stamp[:19] for stamp in map(self.event_time, lines) if stamp is not None]
+        if stamps:
+            first, last = min(stamps), max(stamps)
+        else:
+            first = last = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        raw = "\n".join(lines).encode()
+        block = zlib.compress(raw, COMPRESS_LEVEL)
+        offset = self._data.tell()
+        self._data.write(block)
+        self._data.flush()
+        self._index.write(f"{offset}\t{len(block)}\t{len(lines)}\t{first}\t{last}\n")
+        self._index.flush()
+
+        self._raw_bytes += len(raw)
+        if self.telemetry is not None:
+            self.telemetry.archived_entries.inc(len(lines))
+            self.telemetry.archive_bytes.inc(len(block))
+        if (
+            self._raw_bytes >= self.segment_bytes
+            or time.monotonic() - self._opened_at >= self.segment_seconds
+        ):
+            self.seal()
+
+    @staticmethod
+    def _add_keys(bloom, lines):
+        statuses = set()
+        for line in lines:
+            rid = request_id(line)
+            if rid is not None:
+                bloom.add(f"rid:{rid}")
+            statuses.add(status_code(line))
+        for status in statuses:
+            if status is not None:
+                bloom.add(f"status:{status}")
+
+    def seal(self):
+        self._bloom.save(f"{self.path[:-4]}.bloom")
+        self._data.close()
+        self._index.close()
+        self._open_segment()
+        self._enforce_retention()
+
+    def _enforce_retention(self):
+        sealed = segments(self.directory, self.name)[:-1]
+        sizes = {path: segment_size(path) for path in sealed}
+        total = sum(sizes.values())
+        for path in sealed:
+            if total <= self.max_bytes:
+                break
+            total -= sizes[path]
+            for suffix in SEGMENT_SUFFIXES:
+                try:
+                    os.remove(path[:-4] + suffix)
+                except FileNotFoundError:
+                    pass
+            logger.info(f"Archive retention: removed {path}")
+
+
+class ArchiveWriter:
+    """
+    Runs Archive.write on its own thread. write() only queues the batch;
+    with max_batches already waiting (a stalled disk) the batch is left
+    out of the archive rather than holding up shipping.
+    """
+
+    def __init__(self, archive, max_batches=64):
+        self.archive = archive
+        self.name = archive.name
+        self.dropped = 0
+        self.errors = 0
+        self._queue = queue.Queue(max_batches)
+        self._thread = threading.Thread(target=self._run, name=f"archive-{archive.name}", daemon=True)
+        self._thread.start()
+
+    def write(self, records):
+        """
+        Queue a batch; returns False when it was dropped (queue full).
+        """
+        try:
+            self._queue.put_nowait(records)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def _run(self):
+        while True:
+            records = self._queue.get()
+            try:
+                if records is None:
+                    self.archive.seal()
+                    return
+                self.archive.write(records)
+                if self.errors:
+                    logger.info(f"Archive writes recovered after {self.errors} failed batches")
+                    self.errors = 0
+            except OSError as e:
+                # Logged on the first failure; shipping continues either way
+                if not self.errors:
+                    logger.error(f"Archive write failed: {e}")
+                self.errors += 1
+            finally:
+                self._queue.task_done()
+
+    def join(self):
+        """
+        Wait until every queued batch is written.
+        """
+        self._queue.join()
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+
+def segments(directory, name):
+    return sorted(glob.glob(os.path.join(directory, f"{name}-[0-9]*.seg")))
+
+
+def segment_size(path):
+    """
+    Bytes on disk of a segment with its index and bloom filter.
+    """
+    total = 0
+    for suffix in SEGMENT_SUFFIXES:
+        try:
+            total += os.path.getsize(path[:-4] + suffix)
+        except FileNotFoundError:
+            pass
+    return total
+
+
+# -------------------------------------------------------
+# Query
+# -------------------------------------------------------
+def read_index(path):
+    blocks = []
+    try:
+        with open(f"{path[:-4]}.idx") as f:
+            for row in f:
+                fields = row.rstrip("\n").split("\t")
+                if len(fields) == 5:
+                    blocks.append((int(fields[0]), int(fields[1]), int(fields[2]), fields[3], fields[4]))
+    except FileNotFoundError:
+        pass
+    return blocks
+
+
+class Query:
+    """
+    Matching lines in archive order; stats counts what was pruned.
+    """
+
+    def __init__(self, directory, name, since=None, until=None, request=None, status=None, text=None):
+        with open(os.path.join(directory, f"{name}.meta.json")) as f:
+            self.event_time = EventTime(json.load(f)["time_format"])
+        self.directory = directory
+        self.name = name
+        self.since = since
+        self.until = until
+        self.request = request
+        self.status = status
+        self.text = text
+        self.keys = [key for key in (request and f"rid:{request}", status and f"status:{status}") if key]
+        self.stats = {"segments": 0, "segments_skipped": 0, "blocks": 0, "blocks_read": 0}
+
+    def blocks(self, path):
+        """
+        Blocks of one segment that can hold a match (time index + bloom).
+        """
+        since, until = self.since, self.until
+        blocks = read_index(path)
+        self.stats["segments"] += 1
+        self.stats["blocks"] += len(blocks)
+        blocks = [
+            block
+            for block in blocks
+            if (since is None or block[4] >= since) and (until is None or block[3] <= until)
+        ]
+        if blocks and self.keys and os.path.exists(f"{path[:-4]}.bloom"):
+            bloom = Bloom.load(f"{path[:-4]}.bloom")
+            if not all(key in bloom for key in self.keys):
+                blocks = []
+        if not blocks:
+            self.stats["segments_skipped"] += 1
+        return blocks
+
+    def __iter__(self):
+        since, until = self.since, self.until
+        request, status, text = self.request, self.status, self.text
+        event_time = self.event_time
+
+        for path in segments(self.directory, self.name):
+            blocks = self.blocks(path)
+            if not blocks:
+                continue
+            with open(path, "rb") as f:
+                for offset, length, _, first, _ in blocks:
+                    f.seek(offset)
+                    self.stats["blocks_read"] += 1
+                    for line in zlib.decompress(f.read(length)).decode().split("\n"):
+                        if text and text not in line:
+                            continue
+                        if request and (request not in line or request_id(line) != request):
+                            continue
+                        if status and status_code(line) != status:
+                            continue
+                        if since or until:
+                            stamp = event_time(line)
+                            stamp = stamp[:19] if stamp else first
+                            if (since and stamp < since) or (until and stamp > until):
+                                continue
+                        yield line
+
+
+def main(argv=None):
+    load_env()
+    parser = argparse.ArgumentParser(
+        prog="python3 -m bharatmart_collector.archive",
+        description="Query the local log archive written by the shippers (ARCHIVE_DIR).",
+    )
+    parser.add_argument("collector", help="Shipper name, e.g. backend-logs or nginx-access")
+    parser.add_argument("--dir", default=env_str("ARCHIVE_DIR"), help="Archive directory (default: ARCHIVE_DIR)")
+    parser.add_argument("--since", help="ISO time (UTC unless offset given) or 15m / 2h / 1d ago")
+    parser.add_argument("--until", help="ISO time or duration ago (inclusive, second resolution)")
+    parser.add_argument("--request-id", help="Only lines with this request id")
+    parser.add_argument("--status", help="Only lines with this HTTP status")
+    parser.add_argument("--grep", help="Only lines containing this text")
+    parser.add_argument("--limit", type=int, default=0, help="Stop after N lines")
+    parser.add_argument("--count", action="store_true", help="Print the number of matches only")
+    args = parser.parse_args(argv)
+    if not args.dir:
+        parser.error("--dir or ARCHIVE_DIR is required")
+    if not os.path.exists(os.path.join(args.dir, f"{args.collector}.meta.json")):
+        parser.error(f"no archive for '{args.collector}' in {args.dir} (nothing shipped there yet, or wrong --dir)")
+
+    started = time.perf_counter()
+    matches = Query(
+        args.dir,
+        args.collector,
+        since=time_key(args.since) if args.since else None,
+        until=time_key(args.until) if args.until else None,
+        request=args.request_id,
+        status=args.status,
+        text=args.grep,
+    )
+    count = 0
+    out = sys.stdout
+    for line in matches:
+        count += 1
+        if not args.count:
+            out.write(line + "\n")
+        if count == args.limit:
+            break
+    if args.count:
+        print(count)
+
+    stats = matches.stats
+    print(
+        f"{count} lines; read {stats['blocks_read']}/{stats['blocks']} blocks, "
+        f"skipped {stats['segments_skipped']}/{stats['segments']} segments "
+        f"in {(time.perf_counter() - started) * 1000:.1f} ms",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""
+bharatmart_collector/auth.py
+
+OCI client bootstrap with selectable authentication.
+
+Auth modes (OCI_AUTH or --auth):
+- config_file        : ~/.oci/config, profile OCI_PROFILE (default)
+- instance_principal : InstancePrincipalsSecurityTokenSigner (on OCI compute)
+
+Region resolution: OCI_REGION override, then the config / signer region.
+Service endpoints are derived from the region unless overridden
+(OCI_LOGGING_ENDPOINT / OCI_TELEMETRY_ENDPOINT / OCI_SECRETS_ENDPOINT),
+e.g. for a local stand-in during benchmarks. The Vault secrets endpoint
+comes from the SDK's per-realm template, never a hardcoded region.
+
+Ingestion clients are built without SDK retries or circuit breaker: the
+senders' FlowController handles both and needs to see every 429/503.
+
+Instance principal tokens are refreshed ahead of expiry on a daemon
+thread (halfway through their lifetime), so the SDK's lazy refresh -- a
+metadata and federation round-trip -- never runs inside a send.
+
+Author: BharatMart Observability
+"""
+
+import time
+import logging
+import threading
+
+import oci
+
+logger = logging.getLogger(__name__)
+
+AUTH_MODES = ("config_file", "instance_principal")
+
+LOGGING_ENDPOINT = "https://ingestion.logging.{region}.oraclecloud.com"
+TELEMETRY_ENDPOINT = "https://telemetry-ingestion.{region}.oraclecloud.com"
+
+
+class TokenRefresher:
+    """
+    Refreshes a security-token signer once `fraction` of its token's
+    lifetime has passed; failures are retried while the old token lasts.
+    """
+
+    def __init__(self, signer, fraction=0.5, min_interval=60.0):
+        self.signer = signer
+        self.fraction = fraction
+        self.min_interval = min_interval
+
+    def start(self):
+        threading.Thread(target=self.run, name="token-refresh", daemon=True).start()
+        return self
+
+    def refresh_at(self):
+        claims = self.signer.federation_client.security_token.get_jwt()
+        return claims["iat"] + (claims["exp"] - claims["iat"]) * self.fraction
+
+    def run(self):
+        while True:
+            try:
+                delay = self.refresh_at() - time.time()
+            except Exception as e:
+                logger.warning(f"Cannot read security token expiry: {e}")
+                delay = 0
+            time.sleep(max(delay, self.min_interval))
+            try:
+                self.signer.refresh_security_token()
+                logger.info("Refreshed instance principal security token")
+            except Exception as e:
+                logger.warning(f"Security token refresh failed (will retry): {e}")
+
+
+class OciAuth:
+    """
+    Resolved (config, signer, region) triple used to build any OCI client.
+    """
+
+    def __init__(
+        self,
+        mode="config_file",
+        profile="DEFAULT",
+        region=None,
+        config_file=None,
+        logging_endpoint=None,
+        telemetry_endpoint=None,
+        secrets_endpoint=None,
+        refresh_ahead=True,
+    ):
+        if mode not in AUTH_MODES:
+            raise RuntimeError(f"Unknown OCI auth mode '{mode}' (expected one of {AUTH_MODES})")
+
+        self.mode = mode
+        self.config = {}
+        self.signer = None
+        self.logging_endpoint = logging_endpoint or LOGGING_ENDPOINT
+        self.telemetry_endpoint = telemetry_endpoint or TELEMETRY_ENDPOINT
+        self.secrets_endpoint = secrets_endpoint  # None: derived by the SDK
+
+        if mode == "config_file":
+            try:
+                self.config = oci.config.from_file(
+                    file_location=config_file or oci.config.DEFAULT_LOCATION,
+                    profile_name=profile,
+                )
+            except Exception as e:
+                raise RuntimeError(f"Unable to load OCI config ({profile}): {e}")
+            default_region = self.config.get("region")
+        else:
+            try:
+                self.signer = oci.auth.signers.InstancePrincipalsSecurityTokenSigner()
+            except Exception as e:
+                raise RuntimeError(f"Unable to initialize Instance Principals signer: {e}")
+            default_region = self.signer.region
+            if refresh_ahead:
+                TokenRefresher(self.signer).start()
+
+        self.region = region or default_region
+        if not self.region:
+            raise RuntimeError("Region missing in .env and OCI config / instance metadata")
+
+        logger.debug("OCI auth mode=%s region=%s", self.mode, self.region)
+
+    def client(self, client_class, endpoint_template=None, retry_strategy=None):
+        """
+        endpoint_template=None lets the SDK derive the endpoint from the
+        region (including the realm's domain).
+        """
+        kwargs = {
+            "retry_strategy": retry_strategy or oci.retry.NoneRetryStrategy(),
+            "circuit_breaker_strategy": oci.circuit_breaker.NoCircuitBreakerStrategy(),
+        }
+        if endpoint_template:
+            kwargs["service_endpoint"] = endpoint_template.format(region=self.region)
+        if self.signer is not None:
+            kwargs["signer"] = self.signer
+        client = client_class(dict(self.config, region=self.region), **kwargs)
+        logger.info(f"Using OCI endpoint: {client.base_client.endpoint}")
+        return client
+
+    def logging_client(self):
+        return self.client(oci.loggingingestion.LoggingClient, self.logging_endpoint)
+
+    def monitoring_client(self):
+        return self.client(oci.monitoring.MonitoringClient, self.telemetry_endpoint)
+
+    def secrets_client(self):
+        # Not flow-controlled, so keep the SDK's retries for throttling/5xx
+        return self.client(
+            oci.secrets.SecretsClient,
+            self.secrets_endpoint,
+            retry_strategy=oci.retry.DEFAULT_RETRY_STRATEGY,
+        )
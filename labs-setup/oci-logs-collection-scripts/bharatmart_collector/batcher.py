@@ -0,0 +1,41 @@
+"""
+bharatmart_collector/batcher.py
+
+Batcher stage: groups records into batches by size, with a maximum age so
+a quiet log does not hold a partial batch forever.
+
+Author: BharatMart Observability
+"""
+
+import time
+
+
+class Batcher:
+    def __init__(self, max_size=50, max_age=5.0):
+        self.max_size = max_size
+        self.max_age = max_age
+        self.records = []
+        self._first_at = 0.0
+
+    def __len__(self):
+        return len(self.records)
+
+    def add(self, record):
+        """
+        Append a record; returns the full batch once max_size is reached.
+        """
+        records = self.records
+        if not records:
+            self._first_at = time.monotonic()
+        records.append(record)
+        if len(records) >= self.max_size:
+            return self.drain()
+        return None
+
+    def due(self):
+        return bool(self.records) and time.monotonic() - self._first_at >= self.max_age
+
+    def drain(self):
+        batch = self.records
+        self.records = []
+        return batch
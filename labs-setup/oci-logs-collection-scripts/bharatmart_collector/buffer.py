@@ -0,0 +1,260 @@
+"""
+bharatmart_collector/buffer.py
+
+Send buffer: sits between the batcher and the LogSender so the tail loop
+keeps reading while OCI is slow, throttling or the breaker is open.
+
+Features:
+- Queued batches are packed: one bytes arena holding every entry id and
+  line (UTF-8), newline-separated. That is the payload plus 2 bytes per
+  line, instead of a Record, two str objects and a list slot (~190 bytes
+  of overhead per line), and unpacks with a single decode + split.
+- Memory ceiling on packed bytes, optionally also on process RSS, with a
+  policy once it is reached:
+    block       -- stop reading until a batch is sent (the file is the buffer)
+    spill       -- write the batch to LOG_SPILL_DIR, up to LOG_SPILL_MAX_MB;
+                   beyond that the oldest batches are dropped
+    drop_oldest -- drop the oldest queued batches
+- Gauges for queued entries, memory and spill bytes; counters for spilled
+  batches and dropped entries
+
+One drain thread sends batches in FIFO order and blocks on the flow
+controller's in-flight slots. submit() returns a Future that completes
+once the batch was sent or dropped, so the checkpoint never covers a
+queued batch; it resolves to False when the batch was dropped, which
+holds the checkpoint. Spill files are not replayed after a restart; the
+checkpoint is what survives.
+
+Configuration (.env):
+    LOG_BUFFER_MAX_MB=64
+    LOG_BUFFER_POLICY=block
+    LOG_RSS_MAX_MB=0
+    LOG_SPILL_DIR=/var/lib/bharatmart-collector/spill
+    LOG_SPILL_MAX_MB=1024
+
+Author: BharatMart Observability
+"""
+
+import os
+import glob
+import pickle
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future
+from itertools import chain, repeat
+
+from .parser import Record
+from .telemetry import process_rss
+
+logger = logging.getLogger(__name__)
+
+POLICIES = ("block", "spill", "drop_oldest")
+
+# Approximate bytes per unpacked Record (object, two str headers, list slot)
+RECORD_OVERHEAD = 190
+
+
+class PackedBatch:
+    """
+    The batch as one bytes arena: n entry ids, then n lines, joined with
+    newlines (lines never contain one; a batch where one does is kept as
+    records instead). Once spilled, the arena is dropped and path names
+    the file holding it.
+    """
+
+    __slots__ = ("arena", "unpacked", "count", "size", "future", "path")
+
+    def __init__(self, records, future=None):
+        self.count = len(records)
+        self.arena = "\n".join(
+            chain([record.entry_id or "" for record in records], [record.data for record in records])
+        ).encode()
+        self.unpacked = None
+        if self.arena.count(b"\n") != 2 * self.count - 1:
+            self.arena, self.unpacked = b"", list(records)
+        self.size = len(self.arena) or sum(len(record.data) + RECORD_OVERHEAD for record in records)
+        self.future = future
+        self.path = None
+
+    def __len__(self):
+        return self.count
+
+    def records(self):
+        if self.unpacked is not None:
+            return self.unpacked
+        fields = self.arena.decode().split("\n")
+        n = self.count
+        return list(map(Record, fields[n:], repeat(None, n), fields[:n]))
+
+    def spill(self, path):
+        with open(path, "wb") as f:
+            if self.unpacked is None:
+                f.write(self.arena)
+            else:
+                pickle.dump(self.unpacked, f)
+        self.path = path
+        self.arena = self.unpacked = None
+
+    def load(self):
+        with open(self.path, "rb") as f:
+            data = f.read()
+        if data[:1] == b"\x80":  # pickle marker; UTF-8 text never starts with 0x80
+            self.unpacked = pickle.loads(data)
+        else:
+            self.arena = data
+        self.discard()
+
+    def discard(self):
+        if self.path is not None:
+            try:
+                os.remove(self.path)
+            except OSError as e:
+                logger.warning(f"Could not remove spill file {self.path}: {e}")
+            self.path = None
+
+
+class SendBuffer:
+    def __init__(
+        self,
+        sender,
+        telemetry,
+        name,
+        max_bytes=64 << 20,
+        policy="block",
+        rss_max_bytes=0,
+        spill_dir=None,
+        spill_max_bytes=1 << 30,
+    ):
+        if policy not in POLICIES:
+            raise RuntimeError(f"Unknown LOG_BUFFER_POLICY '{policy}' (expected one of {POLICIES})")
+        if policy == "spill" and not spill_dir:
+            raise RuntimeError("LOG_BUFFER_POLICY=spill requires LOG_SPILL_DIR")
+
+        self.sender = sender
+        self.flow = sender.flow
+        self.telemetry = telemetry
+        self.name = name
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.rss_max_bytes = rss_max_bytes
+        self.spill_dir = spill_dir
+        self.spill_max_bytes = spill_max_bytes
+
+        self.entries = 0
+        self.memory_bytes = 0
+        self.spill_bytes = 0
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._spill_seq = 0
+        self._at_ceiling = False
+        self._draining = False  # drain thread holds a batch it has not submitted yet
+
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+            for stale in glob.glob(os.path.join(spill_dir, f"{name}-*.spill")):
+                os.remove(stale)  # covered by the checkpoint, not replayed
+
+        telemetry.queued.fn = lambda: self.entries
+        telemetry.queue_memory_bytes.fn = lambda: self.memory_bytes
+        telemetry.queue_spill_bytes.fn = lambda: self.spill_bytes
+
+        threading.Thread(target=self._drain, name=f"buffer-{name}", daemon=True).start()
+
+    def submit(self, records):
+        """
+        Queue a batch; blocks only with the block policy at the ceiling.
+        Returns a Future (None for an empty batch). While nothing is queued
+        and a request slot is free, the batch goes straight to the sender.
+        """
+        if not records:
+            return None
+        with self._cond:
+            if not self._queue and not self._draining:
+                future = self.sender.submit(records, block=False)
+                if future is not None:
+                    return future
+
+        batch = PackedBatch(records, Future())
+        with self._cond:
+            self._admit(batch)
+            self._queue.append(batch)
+            self.entries += batch.count
+            self._cond.notify_all()
+        return batch.future
+
+    # ---------------------------------------------------
+    # Ceiling (called with the lock held)
+    # ---------------------------------------------------
+    def _fits(self, batch):
+        if self.memory_bytes + batch.size > self.max_bytes:
+            return False
+        return not self.rss_max_bytes or process_rss() <= self.rss_max_bytes
+
+    def _admit(self, batch):
+        if self._fits(batch):
+            self._at_ceiling = False
+            self.memory_bytes += batch.size
+            return
+        if not self._at_ceiling:
+            self._at_ceiling = True
+            logger.warning(
+                f"{self.name} send buffer at its ceiling "
+                f"({self.memory_bytes / 1e6:.1f} MB queued, {self.entries} entries); "
+                f"policy={self.policy}"
+            )
+
+        while not self._fits(batch):
+            if self.policy == "spill" and self.spill_bytes + batch.size <= self.spill_max_bytes:
+                self._spill_seq += 1
+                batch.spill(os.path.join(self.spill_dir, f"{self.name}-{self._spill_seq:010d}.spill"))
+                self.spill_bytes += batch.size
+                self.telemetry.queue_spilled.inc()
+                return
+            if not self._queue:
+                break  # a lone batch is always admitted
+            if self.policy == "block":
+                self._cond.wait()
+            else:
+                self._drop_oldest()
+        self.memory_bytes += batch.size
+
+    def _drop_oldest(self):
+        victim = self._queue.popleft()
+        self._dequeued(victim)
+        victim.discard()
+        self.telemetry.queue_dropped.inc(victim.count)
+        victim.future.set_result(False)
+
+    def _dequeued(self, batch):
+        self.entries -= batch.count
+        if batch.path is None:
+            self.memory_bytes -= batch.size
+        else:
+            self.spill_bytes -= batch.size
+
+    # ---------------------------------------------------
+    # Drain thread
+    # ---------------------------------------------------
+    def _drain(self):
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                batch = self._queue.popleft()
+                self._dequeued(batch)
+                self._draining = True
+                self._cond.notify_all()
+
+            try:
+                if batch.path is not None:
+                    batch.load()
+                future = self.sender.submit(batch.records())
+            except Exception as e:
+                logger.error(f"Dropping queued batch of {batch.count} entries: {e}")
+                batch.future.set_result(False)
+                continue
+            finally:
+                self._draining = False
+            batch.arena = batch.unpacked = None
+            future.add_done_callback(lambda sent, done=batch.future: done.set_result(sent.result()))
@@ -0,0 +1,234 @@
+"""
+bharatmart_collector/catchup.py
+
+Parallel backlog replay for log shippers.
+
+Closed files (rotated, or .gz) and the part of the live file between the
+checkpoint and its current end are split into newline-aligned byte ranges.
+A process pool parses and ships the ranges: every worker mmaps its file,
+cuts lines with mmap.find, and sends batches through its own LogSender, so
+at most `workers` requests are in flight. .gz files cannot be split and are
+streamed whole by a single worker.
+
+Entry ids use the same host-inode-offset scheme as the live reader, and
+event time comes from the lines, so out-of-order arrival across workers is
+harmless. When the replay finishes, live tailing starts at the exact
+offset where the replayed part of the live file ended.
+
+Usage:
+    python3 -m bharatmart_collector backend-logs --catch-up /var/log/api.log.1 /var/log/api.log.2.gz
+
+Author: BharatMart Observability
+"""
+
+import os
+import gzip
+import mmap
+import time
+import logging
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .checkpoint import warn_skipped
+
+logger = logging.getLogger(__name__)
+
+
+# -------------------------------------------------------
+# Planning
+# -------------------------------------------------------
+def split_ranges(path, start, end, chunk_bytes):
+    """
+    [(start, end)] covering start..end, each ending just after a newline
+    (or at end).
+    """
+    if end <= start:
+        return []
+    ranges = []
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pos = start
+        while pos < end:
+            stop = min(pos + chunk_bytes, end)
+            if stop < end:
+                newline = mm.find(b"\n", stop - 1, end)
+                stop = end if newline < 0 else newline + 1
+            ranges.append((pos, stop))
+            pos = stop
+    return ranges
+
+
+def complete_end(path, start, size):
+    """
+    End of the last complete line at or before size (the live file may end
+    in a partial line the writer has not finished).
+    """
+    if size <= start:
+        return start
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return mm.rfind(b"\n", start, min(size, len(mm))) + 1 or start
+
+
+def plan(files, live_path, resume, chunk_bytes):
+    """
+    Returns (tasks, handoff) where handoff is the (inode, offset) of the
+    live file at which tailing continues.
+
+    files       -- closed files to replay (rotated or .gz)
+    live_path   -- the live log file
+    resume      -- (inode, offset) from the checkpoint, or None
+
+    A closed file whose inode matches the checkpoint is replayed from the
+    checkpointed offset; the live file from the checkpoint offset when it
+    is the checkpointed file, otherwise from the start.
+    """
+    tasks = []
+    resumed = resume is None
+    for path in files:
+        st = os.stat(path)
+        if path.endswith(".gz"):
+            tasks.append((path, 0, st.st_size, st.st_ino, True))
+            continue
+        resumed = resumed or resume[0] == st.st_ino
+        start = resume[1] if resume and resume[0] == st.st_ino else 0
+        for range_start, range_end in split_ranges(path, start, st.st_size, chunk_bytes):
+            tasks.append((path, range_start, range_end, st.st_ino, False))
+
+    st = os.stat(live_path)
+    if not resumed and resume[0] != st.st_ino:
+        # The checkpointed file was rotated and is not among files
+        warn_skipped(resume, live_path)
+    start = resume[1] if resume and resume[0] == st.st_ino and resume[1] <= st.st_size else 0
+    handoff = complete_end(live_path, start, st.st_size)
+    for range_start, range_end in split_ranges(live_path, start, handoff, chunk_bytes):
+        tasks.append((live_path, range_start, range_end, st.st_ino, False))
+    return tasks, (st.st_ino, handoff)
+
+
+# -------------------------------------------------------
+# Worker side
+# -------------------------------------------------------
+class CatchUpWorker:
+    def __init__(self, parser, sender, host):
+        self.parser = parser
+        self.sender = sender
+        self.host = host
+
+    def ship(self, path, start, end, inode, compressed):
+        """
+        Parse and send one range; returns (lines, bytes). Raises when a
+        batch is dropped, so the range counts as failed.
+        """
+        prefix = f"{self.host}-{inode:x}-"
+        parser = self.parser
+        sender = self.sender
+        batch = []
+        lines = 0
+
+        for offset, raw in (
+            self._gzip_lines(path) if compressed else self._mmap_lines(path, start, end)
+        ):
+            if not raw:
+                continue
+            record = parser(raw.decode("utf-8", "replace"))
+            record.entry_id = f"{prefix}{offset:x}"
+            batch.append(record)
+            lines += 1
+            if len(batch) >= sender.flow.batch_size:
+                self._send(batch, path, offset)
+                batch = []
+        if batch:
+            self._send(batch, path, end)
+        return lines, end - start
+
+    def _send(self, batch, path, offset):
+        if self.sender.send(batch) is None:
+            raise RuntimeError(f"batch of {len(batch)} entries up to {path}:{offset} was not accepted")
+
+    def _mmap_lines(self, path, start, end):
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            pos = start
+            while pos < end:
+                newline = mm.find(b"\n", pos, end)
+                stop = end if newline < 0 else newline
+                yield pos, mm[pos:stop]
+                pos = stop + 1
+
+    def _gzip_lines(self, path):
+        offset = 0  # uncompressed
+        with gzip.open(path, "rb") as f:
+            for raw in f:
+                yield offset, raw.rstrip(b"\n")
+                offset += len(raw)
+
+
+_worker = None
+
+
+def _init_worker(factory, factory_args):
+    global _worker
+    _worker = factory(*factory_args)
+
+
+def _ship(task):
+    return _worker.ship(*task)
+
+
+# -------------------------------------------------------
+# Coordinator
+# -------------------------------------------------------
+class CatchUp:
+    def __init__(self, workers, factory, factory_args, progress_interval=5.0):
+        """
+        factory(*factory_args) runs in every worker process and returns a
+        CatchUpWorker; both must be picklable (module-level function).
+        """
+        self.workers = max(1, workers)
+        self.factory = factory
+        self.factory_args = factory_args
+        self.progress_interval = progress_interval
+
+    def run(self, tasks):
+        """
+        Ship all ranges; returns (lines, bytes, failed ranges).
+        """
+        total = sum(task[2] - task[1] for task in tasks)
+        logger.info(
+            f"Catch-up: {len(tasks)} ranges, {total / 1e6:.1f} MB across "
+            f"{len({task[0] for task in tasks})} files with {self.workers} workers"
+        )
+
+        started = time.monotonic()
+        lines = done = failed = 0
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(self.factory, self.factory_args),
+        ) as pool:
+            pending = {pool.submit(_ship, task): task for task in tasks}
+            while pending:
+                finished, _ = wait(pending, timeout=self.progress_interval, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    task = pending.pop(future)
+                    try:
+                        range_lines, range_bytes = future.result()
+                        lines += range_lines
+                        done += range_bytes
+                    except Exception as e:
+                        failed += 1
+                        done += task[2] - task[1]
+                        logger.error(f"Catch-up range {task[0]}[{task[1]}:{task[2]}] failed: {e}")
+                self.report(done, total, lines, time.monotonic() - started)
+
+        elapsed = time.monotonic() - started
+        logger.info(
+            f"Catch-up finished: {lines} lines, {done / 1e6:.1f} MB in {elapsed:.1f}s "
+            f"({lines / max(elapsed, 1e-9):,.0f} lines/s), {failed} failed ranges"
+        )
+        return lines, done, failed
+
+    def report(self, done, total, lines, elapsed):
+        rate = done / elapsed if elapsed > 0 else 0.0
+        eta = (total - done) / rate if rate > 0 else float("inf")
+        logger.info(
+            f"Catch-up: {done / 1e6:.1f}/{total / 1e6:.1f} MB ({100.0 * done / max(total, 1):.0f}%), "
+            f"{rate / 1e6:.1f} MB/s, {lines / max(elapsed, 1e-9):,.0f} lines/s, ETA {eta:.0f}s"
+        )
@@ -0,0 +1,122 @@
+"""
+bharatmart_collector/checkpoint.py
+
+Persisted reader position (inode + byte offset) so a restarted shipper
+resumes where it stopped instead of at the end of the file.
+
+The shipper saves the end offset of the newest batch for which it and
+every earlier batch were accepted by OCI, at most once per min_interval
+seconds, with an atomic rename. Batches in flight at a crash are re-read
+on restart (at-least-once); entry ids are host-inode-offset, so the
+replayed copies carry the same ids. A batch OCI never accepted (retries
+exhausted, fatal error, dropped from the send buffer) holds the
+checkpoint before it for the rest of the run.
+
+Configuration (.env):
+    LOG_CHECKPOINT_DIR=~/.bharatmart-collector
+
+Author: BharatMart Observability
+"""
+
+import os
+import glob
+import json
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Checkpoint:
+    def __init__(self, path, min_interval=1.0):
+        self.path = path
+        self.min_interval = min_interval
+        self._saved = None
+        self._saved_at = 0.0
+
+    def load(self):
+        """
+        (inode, offset) or None when there is no usable checkpoint.
+        """
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+            return int(state["inode"]), int(state["offset"])
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {self.path}: {e}")
+            return None
+
+    def save(self, inode, offset, force=False):
+        """
+        Returns False when skipped because the last save is too recent.
+        """
+        state = (inode, offset)
+        now = time.monotonic()
+        if state == self._saved:
+            return True
+        if not force and now - self._saved_at < self.min_interval:
+            return False
+
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump({"inode": inode, "offset": offset, "saved_at": time.time()}, f)
+        os.replace(tmp, self.path)
+        self._saved = state
+        self._saved_at = now
+        return True
+
+
+def rotated_file(path, inode):
+    """
+    The sibling of path (e.g. api.log.1) that still has this inode, or None.
+    """
+    for candidate in sorted(glob.glob(f"{glob.escape(path)}*")):
+        try:
+            if os.stat(candidate).st_ino == inode:
+                return candidate
+        except OSError:
+            continue
+    return None
+
+
+def warn_skipped(state, path):
+    """
+    Log what a checkpoint for a rotated-away or truncated file leaves
+    unshipped: the bytes after the offset, when the old file is still there.
+    """
+    inode, offset = state
+    old = rotated_file(path, inode)
+    if old is None:
+        logger.warning(
+            f"Checkpoint for inode {inode} at offset {offset} matches neither {path} nor a "
+            f"rotated copy next to it; anything written after that offset is skipped"
+        )
+        return
+    skipped = os.path.getsize(old) - offset
+    if old == path:
+        logger.warning(
+            f"{path} is shorter than its checkpoint ({offset} bytes; truncated?); "
+            f"starting at end of file"
+        )
+        return
+    logger.warning(
+        f"{path} rotated since the checkpoint: skipping {max(skipped, 0)} unshipped bytes "
+        f"of {old} (inode {inode}); replay them with --catch-up {old}"
+    )
+
+
+def resume_offset(state, path):
+    """
+    Offset to resume the live file at, or None (start at the end) when the
+    (inode, offset) state is missing or belongs to a rotated-away file.
+    """
+    if state is None:
+        return None
+    inode, offset = state
+    st = os.stat(path)
+    if st.st_ino != inode or offset > st.st_size:
+        warn_skipped(state, path)
+        return None
+    return offset
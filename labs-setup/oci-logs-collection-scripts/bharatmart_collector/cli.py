@@ -0,0 +1,485 @@
+"""
+bharatmart_collector/cli.py
+
+Single entry point for all BharatMart collectors:
+
+    python3 -m bharatmart_collector backend-logs
+    python3 -m bharatmart_collector nginx-access [--auth instance_principal]
+    python3 -m bharatmart_collector nginx-error  [--parser json]
+    python3 -m bharatmart_collector backend-metrics
+    python3 -m bharatmart_collector backend-logs --catch-up /var/log/api.log.1 [--catch-up-only]
+
+The *-to-oci.py scripts next to this package are thin wrappers around it.
+
+Author: BharatMart Observability
+"""
+
+import os
+import socket
+import logging
+import argparse
+
+from .auth import AUTH_MODES, OciAuth
+from .batcher import Batcher
+from .buffer import SendBuffer
+from .checkpoint import Checkpoint, resume_offset
+from .config import (
+    env_bool,
+    env_float,
+    env_int,
+    env_list,
+    env_str,
+    load_env,
+    require_env,
+)
+from .diagnostics import Diagnostics
+from .flow import FlowController
+from .parser import PARSERS, get_parser
+from .reader import FileTailer
+from .reduce import Reducer, parse_sample_rates
+from .routing import Lane, RoutingTable, parse_lanes, parse_routes
+from .sender import MAX_METRIC_STREAMS, LogSender, MetricSender
+from .shipper import LogShipper
+from .telemetry import MetricsTelemetry, SenderTelemetry, ShipperTelemetry
+from .timestamps import EventTime
+
+logger = logging.getLogger("bharatmart_collector")
+
+# -------------------------------------------------------
+# Log shipper definitions
+# -------------------------------------------------------
+LOG_SHIPPERS = {
+    "backend-logs": {
+        "log_id_env": "BACKEND_LOG_OCID",
+        "file_env": "BACKEND_LOG_FILE",
+        "type": "backend_app",
+        "subject": "api.log",
+        "time_format": "json",
+        "telemetry_port_env": "BACKEND_LOGS_TELEMETRY_PORT",
+        "auth": "config_file",
+        "parser": "raw",
+    },
+    "nginx-access": {
+        "log_id_env": "NGINX_ACCESS_LOG_OCID",
+        "file_env": "NGINX_ACCESS_LOG_FILE",
+        "type": "nginx_access",
+        "subject": "access.log",
+        "time_format": "nginx_access",
+        "telemetry_port_env": "NGINX_ACCESS_TELEMETRY_PORT",
+        "auth": "instance_principal",
+        "parser": "raw",
+        "log_metrics": True,
+        "sampling": True,
+    },
+    "nginx-error": {
+        "log_id_env": "NGINX_ERROR_LOG_OCID",
+        "file_env": "NGINX_ERROR_LOG_FILE",
+        "type": "nginx_error",
+        "subject": "error.log",
+        "time_format": "nginx_error",
+        "telemetry_port_env": "NGINX_ERROR_TELEMETRY_PORT",
+        "auth": "config_file",
+        "parser": "raw",
+    },
+}
+
+COLLECTORS = list(LOG_SHIPPERS) + ["backend-metrics"]
+
+
+def setup_logging(tag):
+    logging.basicConfig(
+        level=env_str("LOG_LEVEL", "INFO").upper(),
+        format=f"%(asctime)s [%(levelname)s] {tag}: %(message)s",
+    )
+
+
+def make_auth(args, default_mode):
+    mode = args.auth or env_str("OCI_AUTH") or default_mode
+    return OciAuth(
+        mode=mode,
+        profile=env_str("OCI_PROFILE", "DEFAULT"),
+        region=env_str("OCI_REGION"),
+        config_file=env_str("OCI_CONFIG_FILE"),
+        logging_endpoint=env_str("OCI_LOGGING_ENDPOINT"),
+        telemetry_endpoint=env_str("OCI_TELEMETRY_ENDPOINT"),
+        secrets_endpoint=env_str("OCI_SECRETS_ENDPOINT"),
+        refresh_ahead=env_bool("SIGNER_REFRESH_AHEAD", True),
+    )
+
+
+def make_secret_provider(auth):
+    from .vault import SecretProvider
+
+    return SecretProvider(
+        auth.secrets_client(),
+        ttl=env_float("SECRET_TTL_SECONDS", 300),
+        refresh_ahead=env_float("SECRET_REFRESH_AHEAD", 0.8),
+        max_stale=env_float("SECRET_MAX_STALE_SECONDS", 3600),
+        cache_path=env_str("SECRET_CACHE_FILE"),
+        cache_key=env_str("SECRET_CACHE_KEY"),
+    )
+
+
+def make_flow(telemetry, batch_size, batch_max):
+    return FlowController(
+        telemetry,
+        batch_size=batch_size,
+        batch_min=env_int("FLOW_BATCH_MIN", 10),
+        batch_max=batch_max,
+        batch_step=env_int("FLOW_BATCH_STEP", 10),
+        concurrency_max=env_int("FLOW_CONCURRENCY_MAX", 4),
+        latency_target=env_float("FLOW_LATENCY_TARGET_MS", 500) / 1000.0,
+        max_retries=env_int("MAX_RETRIES", 5),
+        breaker_failures=env_int("BREAKER_FAILURES", 5),
+        breaker_cooldown=env_float("BREAKER_COOLDOWN_SECONDS", 30),
+    )
+
+
+def make_diagnostics(telemetry):
+    return Diagnostics(
+        logging.getLogger("bharatmart_collector.shipper"),
+        summary_interval=env_float("DIAG_SUMMARY_INTERVAL_SECONDS", 60),
+        rate_limit_seconds=env_float("DIAG_RATE_LIMIT_SECONDS", 5),
+        extra=lambda: {
+            "lines": telemetry.lines_read.value,
+            "batches_sent": telemetry.batches_sent.value,
+            "retries": telemetry.send_retries.value,
+            "throttled": telemetry.send_throttled.value,
+            "deduplicated": telemetry.lines_deduplicated.value,
+            "sampled_out": telemetry.lines_sampled_out.value,
+            "dropped": telemetry.entries_dropped.value,
+            "queue_dropped": telemetry.queue_dropped.value,
+            "archived": telemetry.archived_entries.value,
+        },
+    )
+
+
+def make_log_sender(spec, auth, telemetry):
+    return LogSender(
+        auth.logging_client(),
+        require_env(spec["log_id_env"]),
+        source=socket.gethostname(),
+        log_type=spec["type"],
+        subject=spec["subject"],
+        telemetry=telemetry,
+        flow=make_flow(
+            telemetry, env_int("LOG_BATCH_SIZE", 50), env_int("LOG_BATCH_SIZE_MAX", 1000)
+        ),
+        event_time=EventTime(spec["time_format"]) if env_bool("LOG_EVENT_TIME", True) else None,
+    )
+
+
+def make_send_buffer(name, sender, telemetry):
+    max_mb = env_float("LOG_BUFFER_MAX_MB", 64)
+    if max_mb <= 0:
+        return sender
+    spill_dir = env_str("LOG_SPILL_DIR")
+    return SendBuffer(
+        sender,
+        telemetry,
+        name,
+        max_bytes=int(max_mb * (1 << 20)),
+        policy=env_str("LOG_BUFFER_POLICY", "block").lower(),
+        rss_max_bytes=int(env_float("LOG_RSS_MAX_MB", 0) * (1 << 20)),
+        spill_dir=spill_dir,
+        spill_max_bytes=int(env_float("LOG_SPILL_MAX_MB", 1024) * (1 << 20)),
+    )
+
+
+def make_checkpoint(name):
+    directory = env_str("LOG_CHECKPOINT_DIR")
+    if not directory:
+        return None
+    directory = os.path.expanduser(directory)
+    try:
+        os.makedirs(directory, exist_ok=True)
+    except OSError as e:
+        logger.warning(f"LOG_CHECKPOINT_DIR {directory} unusable ({e}); running without a checkpoint")
+        return None
+    return Checkpoint(os.path.join(directory, f"{name}.checkpoint.json"))
+
+
+# -------------------------------------------------------
+# Builders
+# -------------------------------------------------------
+def build_log_shipper(name, args, store=None, start=None):
+    """
+    start -- (inode, offset) to tail from (catch-up handoff); defaults to
+             the checkpoint, else the end of the file.
+    """
+    spec = LOG_SHIPPERS[name]
+    path = require_env(spec["file_env"])
+
+    auth = make_auth(args, spec["auth"])
+    telemetry = ShipperTelemetry(spec["type"], path)
+    telemetry.serve(env_int(spec["telemetry_port_env"], 0))
+
+    sender = make_send_buffer(name, make_log_sender(spec, auth, telemetry), telemetry)
+
+    tap = None
+    if spec.get("log_metrics") and env_bool("ACCESS_LOG_METRICS"):
+        tap = build_access_log_metrics(auth).start().observe
+
+    reducer = build_reducer(spec, telemetry)
+    archive = build_archive(name, spec, telemetry)
+
+    if start is None and store is not None:
+        start = store.load()
+    start_offset = resume_offset(start, path)
+    if start_offset is not None:
+        logger.info(f"Resuming {path} at offset {start_offset}")
+
+    return LogShipper(
+        name,
+        reader=FileTailer(path, telemetry, host=socket.gethostname(), start_offset=start_offset),
+        parser=get_parser(args.parser or spec["parser"]),
+        batcher=Batcher(
+            max_size=sender.flow.batch_size,
+            max_age=env_float("LOG_FLUSH_INTERVAL_SECONDS", 5),
+        ),
+        sender=sender,
+        telemetry=telemetry,
+        diag=make_diagnostics(telemetry),
+        tap=tap,
+        reducer=reducer,
+        store=store,
+        archive=archive,
+    )
+
+
+def build_archive(name, spec, telemetry):
+    directory = env_str("ARCHIVE_DIR")
+    if not directory:
+        return None
+    from .archive import Archive, ArchiveWriter
+
+    archive = Archive(
+        directory,
+        name,
+        spec["time_format"],
+        telemetry,
+        segment_bytes=int(env_float("ARCHIVE_SEGMENT_MB", 64) * (1 << 20)),
+        segment_seconds=env_float("ARCHIVE_SEGMENT_SECONDS", 3600),
+        max_bytes=int(env_float("ARCHIVE_MAX_MB", 2048) * (1 << 20)),
+    )
+    return ArchiveWriter(archive)
+
+
+def catchup_worker(name, auth_mode, parser_name):
+    """
+    Runs once in every catch-up process: its own OCI client and sender.
+    """
+    from .catchup import CatchUpWorker
+
+    load_env()
+    spec = LOG_SHIPPERS[name]
+    auth = make_auth(argparse.Namespace(auth=auth_mode), spec["auth"])
+    telemetry = ShipperTelemetry(spec["type"], require_env(spec["file_env"]))
+    return CatchUpWorker(
+        parser=get_parser(parser_name or spec["parser"]),
+        sender=make_log_sender(spec, auth, telemetry),
+        host=socket.gethostname(),
+    )
+
+
+def run_catch_up(name, args, store):
+    """
+    Replay the backlog; returns the (inode, offset) live tailing continues
+    from and whether every range was shipped. The checkpoint only moves
+    there when it was.
+    """
+    from .catchup import CatchUp, plan
+
+    path = require_env(LOG_SHIPPERS[name]["file_env"])
+    tasks, handoff = plan(
+        args.catch_up or [],
+        path,
+        store.load() if store is not None else None,
+        chunk_bytes=env_int("CATCHUP_CHUNK_MB", 64) << 20,
+    )
+    _, _, failed = CatchUp(
+        workers=env_int("CATCHUP_WORKERS", os.cpu_count() or 1),
+        factory=catchup_worker,
+        factory_args=(name, args.auth, args.parser),
+        progress_interval=env_float("CATCHUP_PROGRESS_SECONDS", 5),
+    ).run(tasks)
+
+    if failed:
+        logger.error(f"{failed} catch-up ranges failed; checkpoint not advanced, rerun --catch-up")
+    elif store is not None:
+        store.save(*handoff, force=True)
+    return handoff, not failed
+
+
+def build_reducer(spec, telemetry):
+    dedup = (env_str("LOG_DEDUP") or "off").lower()
+    sample_rates = {}
+    if spec.get("sampling"):
+        sample_rates = parse_sample_rates(env_str("ACCESS_LOG_SAMPLE_RATES", ""))
+
+    if dedup == "off" and not sample_rates:
+        return None
+    return Reducer(
+        telemetry,
+        dedup=dedup,
+        window=env_float("LOG_DEDUP_WINDOW_SECONDS", 10),
+        max_keys=env_int("LOG_DEDUP_MAX_KEYS", 10000),
+        sample_rates=sample_rates,
+    )
+
+
+def build_access_log_metrics(auth):
+    from .logmetrics import AccessLogMetrics
+
+    telemetry = SenderTelemetry(shipper="nginx_access_metrics")
+    telemetry.serve(env_int("ACCESS_LOG_METRICS_TELEMETRY_PORT", 0))
+
+    sender = MetricSender(
+        auth.monitoring_client(),
+        telemetry,
+        flow=make_flow(telemetry, MAX_METRIC_STREAMS, MAX_METRIC_STREAMS),
+    )
+    return AccessLogMetrics(
+        sender,
+        namespace=env_str("METRIC_NAMESPACE_FRONTEND", "bharatmart_frontend"),
+        compartment_id=require_env("COMPARTMENT_OCID"),
+        hostname=socket.gethostname(),
+        interval=env_float("ACCESS_LOG_METRICS_INTERVAL_SECONDS", 60),
+        max_routes=env_int("ACCESS_LOG_METRICS_MAX_ROUTES", 200),
+    )
+
+
+def build_router(compartment_id):
+    """
+    Default lane -> METRIC_NAMESPACE_BACKEND at the scrape interval.
+    The business lane always exists; it follows the scrape interval unless
+    METRIC_BUSINESS_FLUSH_SECONDS gives it its own cadence (each of its
+    flushes is a full scrape). METRIC_LANES adds or overrides lanes,
+    METRIC_ROUTES maps prefixes to them.
+    """
+    business_flush = env_str("METRIC_BUSINESS_FLUSH_SECONDS", "")
+    default = Lane("default", env_str("METRIC_NAMESPACE_BACKEND", "bharatmart_backend"), compartment_id)
+    lanes = {
+        "default": default,
+        "business": Lane(
+            "business",
+            env_str("METRIC_NAMESPACE_BUSINESS", "bharatmart_business"),
+            compartment_id,
+            flush_interval=float(business_flush) if business_flush else None,
+        ),
+    }
+    lanes.update(parse_lanes(env_str("METRIC_LANES", ""), compartment_id))
+    routes = parse_routes(env_str("METRIC_ROUTES", "orders_=business,payments_=business"), lanes)
+    return RoutingTable(lanes["default"], routes)
+
+
+def build_metrics_collector(args):
+    # Imported here so log shippers do not need prometheus_client/requests
+    from .metrics import MetricsCollector
+
+    compartment_id = require_env("COMPARTMENT_OCID")
+    endpoint = require_env("BACKEND_METRICS_ENDPOINT")
+    router = build_router(compartment_id)
+
+    auth = make_auth(args, "config_file")
+    telemetry = MetricsTelemetry()
+    telemetry.serve(env_int("BACKEND_METRICS_TELEMETRY_PORT", 0))
+
+    sender = MetricSender(
+        auth.monitoring_client(),
+        telemetry,
+        flow=make_flow(telemetry, MAX_METRIC_STREAMS, MAX_METRIC_STREAMS),
+    )
+
+    scrape_token = None
+    token_secret = env_str("BACKEND_METRICS_TOKEN_SECRET_OCID")
+    if token_secret:
+        secrets = make_secret_provider(auth)
+        secrets.get(token_secret)  # fail fast on a wrong OCID / missing policy
+        scrape_token = lambda: secrets.get(token_secret)  # noqa: E731
+
+    return MetricsCollector(
+        endpoint,
+        router=router,
+        compartment_id=compartment_id,
+        hostname=socket.gethostname(),
+        sender=sender,
+        telemetry=telemetry,
+        interval=env_float("SCRAPE_INTERVAL_SECONDS", 15),
+        change_only=env_bool("CHANGE_ONLY_EMISSION"),
+        heartbeat_intervals=env_int("HEARTBEAT_INTERVALS", 10),
+        adaptive=env_bool("ADAPTIVE_SCRAPE"),
+        interval_min=env_float("SCRAPE_INTERVAL_MIN_SECONDS", 5),
+        interval_max=env_float("SCRAPE_INTERVAL_MAX_SECONDS", 60),
+        sli_change_threshold=env_float("SLI_CHANGE_THRESHOLD", 0.3),
+        key_sli_metrics=env_list(
+            "KEY_SLI_METRICS",
+            "http_requests_total,http_request_duration_seconds_avg,orders_failed_total",
+        ),
+        push_self_telemetry=env_bool("PUSH_SELF_TELEMETRY"),
+        self_telemetry_endpoints=env_list("SELF_TELEMETRY_ENDPOINTS"),
+        collector_namespace=env_str("METRIC_NAMESPACE_COLLECTOR", "bharatmart_collector"),
+        max_series=env_int("SERIES_CACHE_SIZE", 10000),
+        scrape_token=scrape_token,
+    )
+
+
+# -------------------------------------------------------
+# Entry point
+# -------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python3 -m bharatmart_collector",
+        description="Ship BharatMart logs and metrics to OCI.",
+    )
+    parser.add_argument("collector", choices=COLLECTORS)
+    parser.add_argument(
+        "--auth",
+        choices=AUTH_MODES,
+        help="OCI authentication (default: OCI_AUTH from .env, else the collector's default)",
+    )
+    parser.add_argument(
+        "--parser",
+        choices=sorted(PARSERS),
+        help="Log line parser for log shippers (default: raw)",
+    )
+    parser.add_argument(
+        "--catch-up",
+        nargs="*",
+        metavar="FILE",
+        help="Replay rotated/.gz files and the live file's unshipped part in parallel, then tail",
+    )
+    parser.add_argument(
+        "--catch-up-only",
+        action="store_true",
+        help="Exit after the catch-up instead of tailing",
+    )
+    args = parser.parse_args(argv)
+    if args.catch_up_only and args.catch_up is None:
+        args.catch_up = []
+    if args.catch_up is not None and args.collector == "backend-metrics":
+        parser.error("--catch-up applies to log shippers only")
+
+    load_env()
+    setup_logging(args.collector)
+
+    if args.collector == "backend-metrics":
+        collector = build_metrics_collector(args)
+    else:
+        store = make_checkpoint(args.collector)
+        start = None
+        if args.catch_up is not None:
+            start, complete = run_catch_up(args.collector, args, store)
+            if args.catch_up_only:
+                if not complete:
+                    raise SystemExit(1)
+                return
+            if not complete:
+                # Tailing on must not move the checkpoint past the failed backlog
+                store = None
+        collector = build_log_shipper(args.collector, args, store=store, start=start)
+
+    try:
+        collector.run()
+    except KeyboardInterrupt:
+        logger.info("Interrupted; exiting.")
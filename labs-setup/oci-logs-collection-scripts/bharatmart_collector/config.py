@@ -0,0 +1,54 @@
+"""
+bharatmart_collector/config.py
+
+Shared .env loading and typed environment lookups.
+
+Every collector reads the same .env file: python-dotenv searches upward
+from this package, so the lab .env next to the scripts is found whatever
+the current directory. BHARATMART_SKIP_DOTENV=1 skips it (benchmarks
+pin their own environment). Missing mandatory settings raise
+RuntimeError with the variable name.
+
+Author: BharatMart Observability
+"""
+
+import os
+
+from dotenv import load_dotenv
+
+_loaded = False
+
+
+def load_env():
+    global _loaded
+    if not _loaded:
+        if os.getenv("BHARATMART_SKIP_DOTENV") != "1":
+            load_dotenv()
+        _loaded = True
+
+
+def env_str(name, default=None):
+    return os.getenv(name, default)
+
+
+def env_int(name, default):
+    return int(os.getenv(name, str(default)))
+
+
+def env_float(name, default):
+    return float(os.getenv(name, str(default)))
+
+
+def env_bool(name, default=False):
+    return os.getenv(name, "true" if default else "false").lower() == "true"
+
+
+def env_list(name, default=""):
+    return [item.strip() for item in os.getenv(name, default).split(",") if item.strip()]
+
+
+def require_env(name):
+    value = os.getenv(name)
+    if not value:
+        raise RuntimeError(f"{name} missing in .env")
+    return value
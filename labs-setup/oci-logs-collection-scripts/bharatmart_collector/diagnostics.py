@@ -0,0 +1,99 @@
+"""
+bharatmart_collector/diagnostics.py
+
+Sampled diagnostics for the collectors' hot loops.
+
+Features:
+- Level-guarded: nothing is formatted when DEBUG is filtered out
+- Lazy %-style formatting, done by logging only if a record is emitted
+- Per-key rate limiting with a count of suppressed messages
+- Periodic summary line instead of one line per event
+
+Usage in a tail loop:
+
+    diag = Diagnostics(logger, extra=lambda: {"lines": telemetry.lines_read.value})
+    diag.count("idle_ticks")                     # plain dict increment
+    diag.debug("send", "Sending batch (attempt %d)", attempt)
+    diag.tick()                                  # emits a summary when due
+
+Author: BharatMart Observability
+"""
+
+import time
+import logging
+
+
+class Diagnostics:
+    def __init__(self, logger, summary_interval=60.0, rate_limit_seconds=5.0, extra=None):
+        """
+        summary_interval   -- seconds between summary lines (0 disables them)
+        rate_limit_seconds -- minimum gap between two debug() lines per key
+        extra              -- callable returning cumulative numeric counters
+                              (e.g. from self-telemetry); the summary reports
+                              their change since the previous summary
+        """
+        self.logger = logger
+        self.summary_interval = summary_interval
+        self.rate_limit_seconds = rate_limit_seconds
+        self.extra = extra
+
+        self.debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        self.counts = {}
+        self._last_debug = {}
+        self._suppressed = {}
+        self._last_summary = time.monotonic()
+        self._last_extra = dict(extra()) if extra else {}
+
+    def count(self, event, amount=1):
+        counts = self.counts
+        counts[event] = counts.get(event, 0) + amount
+
+    def debug(self, key, msg, *args):
+        """
+        Rate-limited logger.debug(msg, *args). Arguments are only formatted
+        when the line is actually emitted.
+        """
+        if not self.debug_enabled:
+            return
+
+        now = time.monotonic()
+        if now - self._last_debug.get(key, -self.rate_limit_seconds) < self.rate_limit_seconds:
+            self._suppressed[key] = self._suppressed.get(key, 0) + 1
+            return
+
+        self._last_debug[key] = now
+        suppressed = self._suppressed.pop(key, 0)
+        if suppressed:
+            self.logger.debug(msg + " (+%d similar suppressed)", *args, suppressed)
+        else:
+            self.logger.debug(msg, *args)
+
+    def tick(self, now=None):
+        """
+        Emit a summary line if summary_interval has elapsed. Cheap enough
+        to call on every idle tick and batch boundary.
+        """
+        if not self.summary_interval:
+            return
+
+        now = time.monotonic() if now is None else now
+        elapsed = now - self._last_summary
+        if elapsed < self.summary_interval:
+            return
+
+        fields = dict(self.counts)
+        if self.extra:
+            current = self.extra()
+            for name, value in current.items():
+                fields[name] = value - self._last_extra.get(name, 0)
+            self._last_extra = dict(current)
+
+        if fields:
+            self.logger.info(
+                "Summary (last %.0fs): %s",
+                elapsed,
+                " ".join(f"{k}={v}" for k, v in fields.items()),
+            )
+
+        self.counts = {}
+        self._last_summary = now
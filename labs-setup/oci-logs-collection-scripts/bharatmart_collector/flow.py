@@ -0,0 +1,243 @@
+"""
+bharatmart_collector/flow.py
+
+AIMD flow control shared by the log and metric senders.
+
+Features:
+- Batch size and in-flight request limit grow additively while send
+  latency stays under target, and shrink multiplicatively on 429/503
+  (or when latency exceeds twice the target), at most once per
+  decrease window so a burst of rejections counts as one signal
+- Retry-After is honoured for every worker, not just the one throttled
+- Errors are classified: throttled, retryable (5xx, network) or fatal
+  (4xx other than 401/408/409/429), so fatal batches are not retried
+- Circuit breaker: after breaker_failures consecutive failures sends pause
+  for a cooldown, then a single half-open probe decides whether the rest
+  resume (cooldown doubles while the probe is throttled or fails
+  transiently; a fatal 4xx still proves the service is up and closes it)
+- Current settings exposed as self-telemetry gauges
+
+The OCI clients are created without SDK retries and circuit breaker so
+that this controller sees the raw throttling signals.
+
+Author: BharatMart Observability
+"""
+
+import time
+import random
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+
+logger = logging.getLogger(__name__)
+
+THROTTLED = "throttled"
+RETRYABLE = "retryable"
+FATAL = "fatal"
+
+RETRYABLE_4XX = (401, 408, 409)  # 401: instance principal token refresh
+
+
+def classify(error):
+    status = getattr(error, "status", None)  # oci.exceptions.ServiceError
+    if status in (429, 503):
+        return THROTTLED
+    if status is not None and 400 <= status < 500 and status not in RETRYABLE_4XX:
+        return FATAL
+    return RETRYABLE
+
+
+def retry_after(error):
+    """
+    Seconds from a Retry-After header (delta or HTTP date), or None.
+    """
+    headers = getattr(error, "headers", None) or {}
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except Exception:
+        return None
+
+
+class FlowController:
+    def __init__(
+        self,
+        telemetry=None,
+        batch_size=50,
+        batch_min=10,
+        batch_max=1000,
+        batch_step=10,
+        concurrency_max=4,
+        latency_target=0.5,
+        decrease_factor=0.5,
+        max_retries=5,
+        breaker_failures=5,
+        breaker_cooldown=30.0,
+        breaker_cooldown_max=300.0,
+        decrease_window=1.0,
+    ):
+        self.batch_min = batch_min
+        self.batch_max = max(batch_max, batch_min)
+        self.batch_step = batch_step
+        self.concurrency_max = max(1, concurrency_max)
+        self.latency_target = latency_target
+        self.decrease_factor = decrease_factor
+        self.max_retries = max_retries
+        self.breaker_failures = breaker_failures
+        self.breaker_cooldown = breaker_cooldown
+        self.breaker_cooldown_max = breaker_cooldown_max
+        self.decrease_window = decrease_window
+
+        self.lock = threading.Lock()
+        self._slot_free = threading.Condition(self.lock)
+        self._batch = float(min(max(batch_size, batch_min), self.batch_max))
+        self._concurrency = 1.0
+        self.in_flight = 0
+        self._successes = 0  # since the last concurrency increase
+        self._failures = 0  # consecutive
+        self._decreased_at = float("-inf")
+        self._hold_until = 0.0  # Retry-After
+        self._open_until = 0.0  # circuit breaker
+        self._cooldown = breaker_cooldown
+        self.state = "closed"
+
+        if telemetry is not None:
+            telemetry.flow_batch_size.fn = lambda: self.batch_size
+            telemetry.flow_concurrency.fn = lambda: self.concurrency
+            telemetry.flow_in_flight.fn = lambda: self.in_flight
+            telemetry.breaker_open.fn = lambda: int(self.state != "closed")
+
+    @property
+    def batch_size(self):
+        return int(self._batch)
+
+    @property
+    def concurrency(self):
+        return int(self._concurrency)
+
+    # ---------------------------------------------------
+    # Gates
+    # ---------------------------------------------------
+    def acquire(self):
+        """
+        Block until an in-flight slot is free (backpressure on the caller).
+        """
+        with self._slot_free:
+            while self.in_flight >= self.concurrency:
+                self._slot_free.wait()
+            self.in_flight += 1
+
+    def try_acquire(self):
+        """
+        Take a free in-flight slot without waiting; False when none is free.
+        """
+        with self._slot_free:
+            if self.in_flight >= self.concurrency:
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self):
+        with self._slot_free:
+            self.in_flight -= 1
+            self._slot_free.notify_all()
+
+    def wait_ready(self):
+        """
+        Sleep out a Retry-After hold or an open breaker. Once the cooldown
+        is over exactly one caller goes on as the half-open probe; the
+        others wait until its result closes or re-opens the breaker.
+        """
+        with self._slot_free:
+            while True:
+                if self.state == "half_open":
+                    self._slot_free.wait()
+                    continue
+                delay = max(self._hold_until, self._open_until) - time.monotonic()
+                if delay > 0:
+                    self._slot_free.wait(delay)
+                    continue
+                if self.state == "open":
+                    self.state = "half_open"
+                    logger.info("Circuit breaker half-open: sending probe")
+                return
+
+    def backoff(self, attempt):
+        # Full jitter so retrying workers do not synchronise
+        return random.uniform(0, min(30.0, 2**attempt))
+
+    # ---------------------------------------------------
+    # Feedback
+    # ---------------------------------------------------
+    def on_success(self, latency):
+        with self._slot_free:
+            self._failures = 0
+            self._close_breaker()
+
+            if latency > 2 * self.latency_target:
+                self._decrease("latency %.2fs" % latency)
+                return
+            if latency > self.latency_target:
+                return
+
+            self._batch = min(self.batch_max, self._batch + self.batch_step)
+            self._successes += 1
+            if self._successes >= self._concurrency:
+                self._successes = 0
+                if self._concurrency < self.concurrency_max:
+                    self._concurrency += 1
+                    self._slot_free.notify_all()
+
+    def on_failure(self, kind, error):
+        with self._slot_free:
+            if kind == FATAL:
+                # The service answered; only this batch is bad
+                self._failures = 0
+                self._close_breaker()
+                return
+            if kind == THROTTLED:
+                self._decrease("throttled")
+                hold = retry_after(error)
+                if hold:
+                    self._hold_until = max(self._hold_until, time.monotonic() + hold)
+
+            self._failures += 1
+            if self.state == "half_open" or (
+                self.state == "closed" and self._failures >= self.breaker_failures
+            ):
+                if self.state == "half_open":
+                    self._cooldown = min(self.breaker_cooldown_max, self._cooldown * 2)
+                self.state = "open"
+                self._open_until = time.monotonic() + self._cooldown
+                self._concurrency = 1.0
+                self._slot_free.notify_all()  # waiters re-check the new cooldown
+                logger.warning(
+                    f"Circuit breaker open for {self._cooldown:.0f}s after {self._failures} consecutive failures"
+                )
+
+    def _close_breaker(self):
+        # Caller holds the lock
+        if self.state != "closed":
+            logger.info("Circuit breaker closed")
+            self.state = "closed"
+            self._cooldown = self.breaker_cooldown
+            self._slot_free.notify_all()  # release workers held behind the probe
+
+    def _decrease(self, reason):
+        # Caller holds the lock
+        now = time.monotonic()
+        if now - self._decreased_at < self.decrease_window:
+            return
+        self._decreased_at = now
+        self._batch = max(self.batch_min, self._batch * self.decrease_factor)
+        self._concurrency = max(1.0, self._concurrency * self.decrease_factor)
+        self._successes = 0
+        logger.info(
+            f"Backing off ({reason}): batch_size={self.batch_size} concurrency={self.concurrency}"
+        )
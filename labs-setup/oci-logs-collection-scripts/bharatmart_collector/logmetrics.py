@@ -0,0 +1,289 @@
+"""
+bharatmart_collector/logmetrics.py
+
+Log-to-metric stage for the NGINX access log: aggregates request counts,
+response bytes and request-time percentiles at the edge and publishes them
+to OCI Monitoring, so dashboards do not depend on querying OCI Logging.
+
+Features:
+- Precompiled parser for the NGINX combined format, optionally followed by
+  $request_time / $upstream_addr (positional or rt= / ua=), and for JSON
+  access logs (fields taken from the json parser when it is in use)
+- Routes normalised (query stripped, numeric/hex ids -> :id) and capped at
+  max_routes distinct values so cardinality stays bounded
+- Per-interval counters and a DDSketch per (upstream, status class, route)
+- Published via MonitoringClient.post_metric_data through a MetricSender
+
+Configuration (.env):
+    ACCESS_LOG_METRICS=true
+    ACCESS_LOG_METRICS_INTERVAL_SECONDS=60
+
+Author: BharatMart Observability
+"""
+
+import re
+import json
+import math
+import time
+import logging
+import threading
+from datetime import datetime, timezone
+
+import oci
+
+logger = logging.getLogger(__name__)
+
+# addr - user [time] "METHOD uri proto" status bytes "referer" "agent"<rest>
+# Fallback only: NGINX escapes '"' inside variables as \x22, so the fast
+# path can split on quotes.
+COMBINED = re.compile(
+    r'\S+ \S+ \S+ \[[^\]]*\] "(?:[A-Z]+ )?(\S*)[^"]*" (\d{3}) (\d+|-) "[^"]*" "[^"]*"(.*)'
+)
+ID_SEGMENT = re.compile(r"/(?:\d+|[0-9a-fA-F]{8,}|[0-9a-fA-F-]{36})(?=/|$)")
+
+STATUS_CLASSES = {str(d): f"{d}xx" for d in range(1, 6)}
+QUANTILES = (("p50", 0.5), ("p90", 0.9), ("p99", 0.99))
+
+
+# -------------------------------------------------------
+# Streaming latency sketch
+# -------------------------------------------------------
+class DDSketch:
+    """
+    Relative-error quantile sketch: logarithmic buckets with relative
+    accuracy RELATIVE_ACCURACY (1%), so p99 of 250ms is reported within
+    +/-2.5ms regardless of how many values were added.
+    """
+
+    RELATIVE_ACCURACY = 0.01
+    GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+    INV_LOG_GAMMA = 1.0 / math.log(GAMMA)
+    MIN_VALUE = 1e-9
+
+    __slots__ = ("bins", "zero", "count")
+
+    def __init__(self):
+        self.bins = {}
+        self.zero = 0
+        self.count = 0
+
+    def add(self, value, _log=math.log, _ceil=math.ceil):
+        self.count += 1
+        if value <= self.MIN_VALUE:
+            self.zero += 1
+            return
+        key = _ceil(_log(value) * self.INV_LOG_GAMMA)
+        bins = self.bins
+        bins[key] = bins.get(key, 0) + 1
+
+    def quantile(self, q):
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero
+        if rank < seen:
+            return 0.0
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                return 2 * self.GAMMA**key / (self.GAMMA + 1)
+        return 2 * self.GAMMA ** max(self.bins) / (self.GAMMA + 1)
+
+
+# -------------------------------------------------------
+# Line parsing
+# -------------------------------------------------------
+def _float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_access(record):
+    """
+    Returns (uri, status, bytes, request_time, upstream) or None.
+    request_time is in seconds (None when not logged).
+    """
+    fields = record.fields
+    line = record.data
+
+    if fields is None and line[:1] == "{":
+        try:
+            fields = json.loads(line)
+        except ValueError:
+            return None
+
+    if isinstance(fields, dict):
+        status = str(fields.get("status", ""))
+        if len(status) != 3:
+            return None
+        uri = fields.get("request_uri") or fields.get("uri") or ""
+        if not uri and fields.get("request"):
+            parts = fields["request"].split(" ")
+            uri = parts[1] if len(parts) > 1 else ""
+        return (
+            uri,
+            status,
+            _float(fields.get("body_bytes_sent", fields.get("bytes_sent"))) or 0.0,
+            _float(fields.get("request_time")),
+            fields.get("upstream_addr") or "-",
+        )
+
+    parts = line.split('"')
+    head = parts[2].split() if len(parts) >= 7 else ()
+    if len(head) == 2 and len(head[0]) == 3 and head[0].isdigit():
+        request = parts[1].split(" ", 2)
+        uri = request[1] if len(request) > 1 else request[0]
+        status, size = head
+        rest = '"'.join(parts[6:])
+    else:
+        match = COMBINED.match(line)
+        if match is None:
+            return None
+        uri, status, size, rest = match.groups()
+
+    request_time = None
+    upstream = "-"
+    if "=" in rest:
+        for token in rest.split():
+            key, _, value = token.partition("=")
+            if key in ("rt", "request_time"):
+                request_time = _float(value)
+            elif key in ("ua", "upstream_addr"):
+                upstream = value.strip('"')
+    elif rest:
+        # Positional: $request_time [$upstream_addr]
+        tokens = rest.split()
+        if tokens:
+            request_time = _float(tokens[0])
+            if len(tokens) > 1:
+                upstream = tokens[-1].strip('",')
+
+    return uri, status, _float(size) or 0.0, request_time, upstream
+
+
+# -------------------------------------------------------
+# Aggregation
+# -------------------------------------------------------
+class AccessLogMetrics:
+    def __init__(
+        self,
+        sender,
+        namespace,
+        compartment_id,
+        hostname,
+        interval=60,
+        max_routes=200,
+    ):
+        self.sender = sender
+        self.namespace = namespace
+        self.compartment_id = compartment_id
+        self.hostname = hostname
+        self.interval = interval
+        self.max_routes = max_routes
+
+        self.lock = threading.Lock()
+        self._stats = {}  # (upstream, status class, route) -> [count, bytes, DDSketch]
+        self._routes = {}  # raw path -> normalised route (memo)
+        self._route_set = set()
+        self.unparsed = 0
+
+    def route(self, uri):
+        path = uri.split("?", 1)[0]
+        route = self._routes.get(path)
+        if route is None:
+            route = ID_SEGMENT.sub("/:id", path) or "/"
+            if route not in self._route_set:
+                if len(self._route_set) >= self.max_routes:
+                    route = "other"
+                else:
+                    self._route_set.add(route)
+            if len(self._routes) >= 10 * self.max_routes:
+                self._routes.clear()
+            self._routes[path] = route
+        return route
+
+    def observe(self, record):
+        """
+        Shipper tap: called with every parsed record on the hot path.
+        """
+        parsed = parse_access(record)
+        if parsed is None:
+            self.unparsed += 1
+            return
+        uri, status, size, request_time, upstream = parsed
+        key = (upstream, STATUS_CLASSES.get(status[0], "other"), self.route(uri))
+
+        with self.lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = [0, 0.0, DDSketch()]
+            stats[0] += 1
+            stats[1] += size
+            if request_time is not None:
+                stats[2].add(request_time)
+
+    # ---------------------------------------------------
+    # Publish
+    # ---------------------------------------------------
+    def build(self, stats, timestamp):
+        MetricDataDetails = oci.monitoring.models.MetricDataDetails
+        Datapoint = oci.monitoring.models.Datapoint
+
+        metric_list = []
+        for (upstream, status_class, route), (count, size, sketch) in stats.items():
+            dimensions = {
+                "host": self.hostname,
+                "upstream": upstream,
+                "status_class": status_class,
+                "route": route,
+            }
+            # One datapoint per interval and no Datapoint.count: OCI reads
+            # count as occurrences of value, so sum() would be squared
+            values = [("nginx_requests", count), ("nginx_response_bytes", size)]
+            if sketch.count:
+                values += [
+                    (f"nginx_request_time_ms_{label}", sketch.quantile(q) * 1000)
+                    for label, q in QUANTILES
+                ]
+
+            for name, value in values:
+                metric_list.append(
+                    MetricDataDetails(
+                        name=name,
+                        namespace=self.namespace,
+                        compartment_id=self.compartment_id,
+                        dimensions=dimensions,
+                        datapoints=[Datapoint(timestamp=timestamp, value=float(value))],
+                    )
+                )
+        return metric_list
+
+    def flush(self):
+        with self.lock:
+            stats, self._stats = self._stats, {}
+        if not stats:
+            return
+
+        metric_list = self.build(stats, datetime.now(timezone.utc))
+        logger.info(
+            f"Publishing {len(metric_list)} access-log metric streams "
+            f"({sum(s[0] for s in stats.values())} requests, {self.unparsed} unparsed lines so far)"
+        )
+        self.sender.send(metric_list)
+
+    def run(self):
+        while True:
+            time.sleep(self.interval)
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Access-log metrics flush failed: {e}")
+
+    def start(self):
+        threading.Thread(target=self.run, name="access-log-metrics", daemon=True).start()
+        logger.info(
+            f"Access-log metrics enabled (namespace={self.namespace}, interval={self.interval}s)"
+        )
+        return self
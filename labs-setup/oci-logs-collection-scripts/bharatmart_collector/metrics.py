@@ -0,0 +1,401 @@
+"""
+bharatmart_collector/metrics.py
+
+Scrapes Prometheus metrics from the BharatMart backend (/metrics)
+and pushes them to OCI Monitoring.
+
+Features:
+- Prometheus text parser
+- Histogram _sum/_count → avg
+- Rule-based routing of families to namespaces ("lanes"), each lane
+  with its own compartment, resource group and flush interval
+- LRU series cache: per-scrape work is a value/timestamp patch
+- Optional change-only emission with periodic heartbeat
+- Optional adaptive scrape interval driven by key SLI metrics
+- Optional push of collector self-telemetry (own + log shippers')
+- Optional bearer token for the backend /metrics endpoint, read from
+  OCI Vault through the cached SecretProvider
+
+Author: BharatMart Observability
+"""
+
+import time
+import logging
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+import requests
+import oci
+from prometheus_client.parser import text_string_to_metric_families
+
+from .routing import Lane, RoutingTable
+
+logger = logging.getLogger(__name__)
+
+
+# -------------------------------------------------------
+# Series cache
+# -------------------------------------------------------
+class SeriesCache:
+    """
+    LRU of ready-made MetricDataDetails, one per (name, lane, labels).
+
+    Label sets barely change between scrapes, so the dimensions dict, the
+    model objects and their Datapoint are built once; later scrapes only
+    patch in the value and the shared scrape timestamp. Series that stop
+    appearing fall to the cold end and are evicted past max_series.
+
+    Returned objects are reused on the next scrape, so a metric list must
+    be sent before the next convert call (the collector loop is sequential).
+    """
+
+    def __init__(self, hostname, max_series=10000):
+        self.hostname = hostname
+        self.max_series = max_series
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def series(self, name, lane, labels, value, timestamp):
+        key = (name, lane, labels)
+        entries = self._entries
+        metric = entries.get(key)
+
+        if metric is not None:
+            entries.move_to_end(key)
+            dp = metric.datapoints[0]
+            dp.value = value
+            dp.timestamp = timestamp
+            return metric
+
+        dimensions = {k: str(v) for k, v in labels}
+        dimensions["host"] = self.hostname
+        metric = oci.monitoring.models.MetricDataDetails(
+            name=name,
+            namespace=lane.namespace,
+            compartment_id=lane.compartment_id,
+            resource_group=lane.resource_group,
+            dimensions=dimensions,
+            datapoints=[oci.monitoring.models.Datapoint(timestamp=timestamp, value=value)],
+        )
+        entries[key] = metric
+        if len(entries) > self.max_series:
+            entries.popitem(last=False)
+            self.evictions += 1
+        return metric
+
+
+# -------------------------------------------------------
+# Convert Prometheus → OCI Metrics
+# -------------------------------------------------------
+def convert_prom_to_oci(text_data, router, cache, due=None):
+    """
+    Returns {Lane: [MetricDataDetails]}. Families whose lane is not in
+    due (None = every lane) are skipped before any sample is touched.
+    """
+    # One timestamp per scrape so all datapoints of a cycle line up
+    timestamp = datetime.now(timezone.utc)
+    series = cache.series
+    lookup = router.lookup
+
+    by_lane = {}
+    family_count = 0
+    stream_count = 0
+
+    for family in text_string_to_metric_families(text_data):
+        family_count += 1
+        lane = lookup(family.name)
+        if due is not None and lane not in due:
+            continue
+
+        metric_payloads = by_lane.get(lane)
+        if metric_payloads is None:
+            metric_payloads = by_lane[lane] = []
+        before = len(metric_payloads)
+
+        sum_map = {}
+        count_map = {}
+
+        for sample in family.samples:
+            name = sample.name
+
+            # Histogram / summary internals: collect _sum and _count only
+            if name.endswith("_sum"):
+                sum_map[tuple(sample.labels.items())] = (name[:-4], sample.value)
+                continue
+            if name.endswith("_count"):
+                count_map[tuple(sample.labels.items())] = sample.value
+                continue
+            if name.endswith("_bucket"):
+                continue
+
+            # Counters, gauges, etc.
+            try:
+                value = float(sample.value)
+            except Exception:
+                logger.warning(f"Skipping non-numeric metric: {name}")
+                continue
+
+            metric_payloads.append(
+                series(name, lane, tuple(sample.labels.items()), value, timestamp)
+            )
+
+        # Histogram _sum/_count → avg
+        for labels, (base_name, total_sum) in sum_map.items():
+            count = count_map.get(labels)
+            if count and count > 0:
+                metric_payloads.append(
+                    series(
+                        f"{base_name}_avg",
+                        lane,
+                        labels,
+                        float(total_sum / count),
+                        timestamp,
+                    )
+                )
+
+        stream_count += len(metric_payloads) - before
+
+    logger.info(f"Parsed {family_count} Prometheus metric families")
+    logger.info(f"Prepared {stream_count} OCI metric streams in {len(by_lane)} lane(s)")
+    return by_lane
+
+
+# -------------------------------------------------------
+# Collector
+# -------------------------------------------------------
+class MetricsCollector:
+    def __init__(
+        self,
+        endpoint,
+        router,
+        compartment_id,
+        hostname,
+        sender,
+        telemetry,
+        interval=15,
+        change_only=False,
+        heartbeat_intervals=10,
+        adaptive=False,
+        interval_min=5,
+        interval_max=60,
+        sli_change_threshold=0.3,
+        key_sli_metrics=(),
+        push_self_telemetry=False,
+        self_telemetry_endpoints=(),
+        collector_namespace="bharatmart_collector",
+        max_series=10000,
+        scrape_token=None,
+    ):
+        """
+        scrape_token -- callable returning the bearer token for endpoint
+                        (e.g. a cached Vault lookup), or None
+        """
+        self.endpoint = endpoint
+        self.scrape_token = scrape_token
+        self.router = router
+        self.compartment_id = compartment_id
+        self.hostname = hostname
+        self.sender = sender
+        self.telemetry = telemetry
+        self.interval = interval
+        self.change_only = change_only
+        self.heartbeat_intervals = heartbeat_intervals
+        self.adaptive = adaptive
+        self.interval_min = interval_min
+        self.interval_max = interval_max
+        self.sli_change_threshold = sli_change_threshold
+        self.key_sli_metrics = set(key_sli_metrics)
+        self.push_self_telemetry = push_self_telemetry
+        self.self_telemetry_endpoints = list(self_telemetry_endpoints)
+        self.self_router = RoutingTable(Lane("collector", collector_namespace, compartment_id))
+
+        self.cache = SeriesCache(hostname, max_series)
+        telemetry.series_cached.fn = self.cache.__len__
+
+        self._series_state = {}  # lane -> {series key: (value hash, flush last sent)}
+        self._flushes = {}  # lane -> number of flushes so far
+        self._sli_state = {}  # metric name -> last observed value / rate / time
+
+    # ---------------------------------------------------
+    # Scrape + convert
+    # ---------------------------------------------------
+    def scrape(self, endpoint=None):
+        headers = None
+        if endpoint is None:
+            endpoint = self.endpoint
+            if self.scrape_token is not None:
+                headers = {"Authorization": f"Bearer {self.scrape_token()}"}
+        logger.info(f"Scraping /metrics from {endpoint}")
+        started = time.perf_counter()
+        resp = requests.get(endpoint, headers=headers, timeout=5)
+        self.telemetry.scrape_latency.observe(time.perf_counter() - started)
+        resp.raise_for_status()
+        return resp.text
+
+    def convert(self, text_data, router=None, due=None):
+        return convert_prom_to_oci(text_data, router or self.router, self.cache, due)
+
+    # ---------------------------------------------------
+    # Change-only emission
+    # ---------------------------------------------------
+    def filter_unchanged(self, metric_list, lane):
+        """
+        Drop series whose value hash matches the last one sent on this lane.
+        Every series is still re-sent once per heartbeat_intervals flushes.
+        """
+        changed = []
+        seen = set()
+        state = self._series_state.setdefault(lane, {})
+        flush = self._flushes.get(lane, 0)
+
+        for metric in metric_list:
+            key = hash((metric.name, tuple(sorted(metric.dimensions.items()))))
+            value_hash = hash(metric.datapoints[0].value)
+            seen.add(key)
+
+            previous = state.get(key)
+            if (
+                previous
+                and previous[0] == value_hash
+                and flush - previous[1] < self.heartbeat_intervals
+            ):
+                continue
+
+            state[key] = (value_hash, flush)
+            changed.append(metric)
+
+        self.telemetry.series_skipped.inc(len(metric_list) - len(changed))
+
+        # Forget series that disappeared from /metrics
+        for key in state.keys() - seen:
+            del state[key]
+
+        logger.info(
+            f"Change-only emission [{lane.name}]: {len(changed)}/{len(metric_list)} "
+            f"series changed or due for heartbeat"
+        )
+        return changed
+
+    # ---------------------------------------------------
+    # Adaptive scrape interval
+    # ---------------------------------------------------
+    def detect_sli_shift(self, metric_list, now):
+        """
+        Returns True when any key SLI metric moved more than
+        sli_change_threshold (relative) since it was last observed. Counters
+        (*_total) are compared as per-second rates, everything else as
+        plain values. Lanes flush at different cadences, so each metric
+        keeps its own observation time.
+        """
+        totals = {}
+        for metric in metric_list:
+            if metric.name in self.key_sli_metrics:
+                totals[metric.name] = totals.get(metric.name, 0.0) + metric.datapoints[0].value
+
+        sharp = False
+        for name, value in totals.items():
+            previous = self._sli_state.get(name)
+            self._sli_state[name] = {"value": value, "signal": None, "at": now}
+
+            if previous is None:
+                continue
+
+            if name.endswith("_total"):
+                elapsed = now - previous["at"]
+                if elapsed <= 0 or value < previous["value"]:
+                    continue  # counter reset
+                signal = (value - previous["value"]) / elapsed
+            else:
+                signal = value
+
+            self._sli_state[name]["signal"] = signal
+            old = previous["signal"]
+            if old is None:
+                continue
+
+            change = abs(signal - old) / max(abs(signal), abs(old), 1e-9)
+            if change > self.sli_change_threshold:
+                logger.info(f"Key SLI {name} moved sharply ({old:.4g} -> {signal:.4g})")
+                sharp = True
+
+        return sharp
+
+    def next_interval(self, current, metric_list, now):
+        if self.detect_sli_shift(metric_list, now):
+            return max(self.interval_min, current / 2)
+        return min(self.interval_max, current * 1.25)
+
+    # ---------------------------------------------------
+    # Push self-telemetry through the normal send path
+    # ---------------------------------------------------
+    def send_self_telemetry(self):
+        lanes = self.convert(self.telemetry.render(), self.self_router)
+        metric_list = lanes.get(self.self_router.default, [])
+
+        for endpoint in self.self_telemetry_endpoints:
+            try:
+                text_data = self.scrape(endpoint)
+                lanes = self.convert(text_data, self.self_router)
+                metric_list.extend(lanes.get(self.self_router.default, []))
+            except Exception as e:
+                logger.warning(f"Self-telemetry scrape failed for {endpoint}: {e}")
+
+        self.sender.send(metric_list)
+
+    # ---------------------------------------------------
+    # Run cycle
+    # ---------------------------------------------------
+    def run_once(self, due=None):
+        """
+        Scrape once and flush the lanes in due (None = all).
+        Returns the converted metrics of every flushed lane.
+        """
+        metric_list = []
+        try:
+            text_data = self.scrape()
+            for lane, lane_metrics in self.convert(text_data, due=due).items():
+                metric_list.extend(lane_metrics)
+                if self.change_only:
+                    lane_metrics = self.filter_unchanged(lane_metrics, lane)
+                self._flushes[lane] = self._flushes.get(lane, 0) + 1
+                self.sender.send(lane_metrics)
+        except Exception as e:
+            self.telemetry.scrape_failures.inc()
+            logger.error(f"Error during cycle: {e}")
+
+        if self.push_self_telemetry and (due is None or self.router.default in due):
+            self.send_self_telemetry()
+
+        return metric_list
+
+    def run(self):
+        logger.info(
+            f"Starting backend-metrics collector (lanes={self.router.lanes}, interval={self.interval}s, "
+            f"change_only={self.change_only}, adaptive={self.adaptive})"
+        )
+
+        interval = self.interval
+        self.telemetry.scrape_interval.set(interval)
+        next_flush = {lane: 0.0 for lane in self.router.lanes}
+
+        while True:
+            now = time.monotonic()
+            due = {lane for lane, at in next_flush.items() if at <= now}
+            metric_list = self.run_once(due)
+
+            # Only scrapes of the default lane steer its interval
+            if self.adaptive and metric_list and self.router.default in due:
+                new_interval = self.next_interval(interval, metric_list, now)
+                if new_interval != interval:
+                    logger.info(f"Scrape interval {interval:.1f}s -> {new_interval:.1f}s")
+                interval = new_interval
+                self.telemetry.scrape_interval.set(interval)
+
+            # Lanes without their own flush interval follow the scrape interval
+            for lane in due:
+                next_flush[lane] = now + (lane.flush_interval or interval)
+
+            time.sleep(max(0.0, min(next_flush.values()) - time.monotonic()))
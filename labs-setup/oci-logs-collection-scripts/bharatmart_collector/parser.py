@@ -0,0 +1,54 @@
+"""
+bharatmart_collector/parser.py
+
+Parser stage: turns a raw log line into a Record.
+
+OCI Logging expects LogEntry.data to be a string, so every parser keeps
+the original line as data. Parsers may attach structured fields for later
+stages; the default "raw" parser does no work at all. entry_id is filled
+in by the shipper from the reader position.
+
+Author: BharatMart Observability
+"""
+
+import json
+
+
+class Record:
+    __slots__ = ("data", "fields", "entry_id")
+
+    def __init__(self, data, fields=None, entry_id=None):
+        self.data = data
+        self.fields = fields
+        self.entry_id = entry_id
+
+
+def parse_raw(line):
+    return Record(line)
+
+
+def parse_json(line):
+    """
+    Best-effort JSON: fields is the decoded object for JSON lines and None
+    for plain-text lines.
+    """
+    if line[:1] != "{":
+        return Record(line)
+    try:
+        fields = json.loads(line)
+    except ValueError:
+        return Record(line)
+    return Record(line, fields if isinstance(fields, dict) else None)
+
+
+PARSERS = {
+    "raw": parse_raw,
+    "json": parse_json,
+}
+
+
+def get_parser(name):
+    try:
+        return PARSERS[name]
+    except KeyError:
+        raise RuntimeError(f"Unknown parser '{name}' (expected one of {sorted(PARSERS)})")
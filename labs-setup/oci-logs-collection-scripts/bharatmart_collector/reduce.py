@@ -0,0 +1,215 @@
+"""
+bharatmart_collector/reduce.py
+
+Reduction stage: cuts log volume before upload.
+
+Features:
+- Dedup: lines with the same template (numbers, hex ids and timestamps
+  masked; the HTTP status stays literal) seen again within window seconds
+  are suppressed; the first copy is shipped immediately and one summary
+  entry with the repeat count follows when the window closes. The key
+  table is a bounded insertion-ordered dict, so a flood of distinct
+  templates cannot grow memory.
+- Scope: "errors" dedups only error-level lines (retry storms), "all"
+  every line, "off" disables
+- Sampling of access lines per status class (e.g. 2xx=0.1); 4xx/5xx
+  are never sampled
+- Counters for suppressed, sampled-out and summary entries
+
+Configuration (.env):
+    LOG_DEDUP=errors
+    LOG_DEDUP_WINDOW_SECONDS=10
+    ACCESS_LOG_SAMPLE_RATES=2xx=0.1,3xx=0.5
+
+Author: BharatMart Observability
+"""
+
+import re
+import json
+import time
+import random
+import logging
+
+from .parser import Record
+
+logger = logging.getLogger(__name__)
+
+DEDUP_SCOPES = ("off", "errors", "all")
+
+# Numbers, timestamps, IPs and lowercase hex ids / UUIDs
+VARIABLE = re.compile(r"[0-9][0-9a-f.:-]*|[a-f][0-9a-f-]{7,}")
+JSON_STATUS = re.compile(r'"(?:status|statusCode|status_code)"\s*:\s*"?(\d{3})\b')
+ERROR_HINT = re.compile(
+    r'"level":\s*"(?:error|fatal)"|\[(?:error|crit|alert|emerg)\]|\b(?:ERROR|FATAL|CRITICAL)\b'
+)
+ERROR_WORDS = ("error", "ERROR", "fatal", "FATAL", "crit", "CRITICAL", "alert", "emerg")
+ERROR_CLASSES = ("4xx", "5xx")
+
+
+def parse_sample_rates(spec):
+    """
+    "2xx=0.1,3xx=0.5" -> {"2": 0.1, "3": 0.5}, keyed by the status digit.
+    """
+    rates = {}
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        status_class, sep, rate = item.partition("=")
+        status_class = status_class.strip().lower()
+        if not sep or len(status_class) != 3 or not status_class.endswith("xx"):
+            raise RuntimeError(f"Invalid ACCESS_LOG_SAMPLE_RATES entry '{item}'")
+        if status_class in ERROR_CLASSES:
+            logger.warning(f"Ignoring sample rate for {status_class}: errors are never sampled")
+            continue
+        rates[status_class[0]] = min(1.0, max(0.0, float(rate)))
+    return rates
+
+
+def is_error(data):
+    # Substring scans first: most lines contain none of the words
+    for word in ERROR_WORDS:
+        if word in data:
+            return ERROR_HINT.search(data) is not None
+    return False
+
+
+def http_status(record):
+    """
+    Full HTTP status of a JSON or combined-format line, or None. Kept
+    literal in the dedup key so a 500 never folds into a 200's summary.
+    """
+    if isinstance(record.fields, dict):
+        status = record.fields.get("status")
+        return None if status is None else str(status)
+    data = record.data
+    if data[:1] == "{":
+        match = JSON_STATUS.search(data)
+        return match.group(1) if match else None
+    parts = data.split('"', 3)
+    if len(parts) < 3:
+        return None
+    status = parts[2][:5].strip()[:3]
+    return status if status.isdigit() else None
+
+
+def access_status(record):
+    """
+    First digit of the HTTP status of an access line, or None.
+    """
+    if isinstance(record.fields, dict):
+        return str(record.fields.get("status", ""))[:1] or None
+    parts = record.data.split('"', 3)
+    if len(parts) < 3:
+        return None
+    status = parts[2][:5].strip()
+    return status[:1] if status[:3].isdigit() else None
+
+
+class Reducer:
+    def __init__(
+        self,
+        telemetry,
+        dedup="off",
+        window=10.0,
+        max_keys=10000,
+        sample_rates=None,
+        rng=random.random,
+    ):
+        if dedup not in DEDUP_SCOPES:
+            raise RuntimeError(f"Unknown LOG_DEDUP '{dedup}' (expected one of {DEDUP_SCOPES})")
+
+        self.telemetry = telemetry
+        self.dedup = dedup
+        self.window = window
+        self.max_keys = max_keys
+        self.sample_rates = sample_rates or {}
+        self.rng = rng
+
+        self.expire_due = False
+        self._seen = {}  # template -> [first record, suppressed, window start]
+        self._evicted = []  # closed outside expire(), summarised on the next call
+        self._next_expiry = time.monotonic() + window
+
+    def __call__(self, record):
+        """
+        Returns the record to ship, or None when it was sampled out or
+        collapsed into a pending repeat summary.
+        """
+        if self.sample_rates:
+            rate = self.sample_rates.get(access_status(record))
+            if rate is not None and self.rng() >= rate:
+                self.telemetry.lines_sampled_out.inc()
+                return None
+
+        if self.dedup == "off":
+            return record
+
+        now = time.monotonic()
+        if now >= self._next_expiry:
+            self.expire_due = True
+        if self.dedup == "errors" and not is_error(record.data):
+            return record
+
+        template = (http_status(record), VARIABLE.sub("#", record.data))
+        entry = self._seen.get(template)
+        if entry is not None and now - entry[2] < self.window:
+            entry[1] += 1
+            self.telemetry.lines_deduplicated.inc()
+            return None
+
+        if entry is not None:
+            # Window over but not expired yet: close it and start a new one
+            del self._seen[template]
+            if entry[1]:
+                self._evicted.append(entry)
+                self.expire_due = True
+        self._seen[template] = [record, 0, now]
+        if len(self._seen) > self.max_keys:
+            self._evicted.append(self._seen.pop(next(iter(self._seen))))
+            self.expire_due = True
+        return record
+
+    def expire(self, force=False):
+        """
+        Close finished windows (all of them when force=True) and return
+        their repeat summaries as records.
+        """
+        now = time.monotonic()
+        summaries = []
+        seen = self._seen
+
+        while seen:
+            template = next(iter(seen))
+            first, suppressed, started = seen[template]
+            if not force and now - started < self.window:
+                break  # insertion order == window start order
+            del seen[template]
+            if suppressed:
+                summaries.append(self.summary(first, suppressed, now - started))
+
+        for first, suppressed, started in self._evicted:
+            if suppressed:
+                summaries.append(self.summary(first, suppressed, now - started))
+        self._evicted = []
+
+        self.expire_due = False
+        self._next_expiry = now + min(self.window, 1.0)
+        self.telemetry.dedup_summaries.inc(len(summaries))
+        return summaries
+
+    def summary(self, first, suppressed, elapsed):
+        fields = first.fields
+        if fields is None and first.data[:1] == "{":
+            try:
+                fields = json.loads(first.data)
+            except ValueError:
+                fields = None
+
+        if isinstance(fields, dict):
+            fields = dict(fields, repeated=suppressed, repeat_window_seconds=round(elapsed, 1))
+            return Record(json.dumps(fields), fields, f"{first.entry_id}-r")
+        return Record(
+            f"{first.data} [repeated {suppressed} more times in {elapsed:.0f}s]",
+            entry_id=f"{first.entry_id}-r",
+        )
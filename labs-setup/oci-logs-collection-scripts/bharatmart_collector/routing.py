@@ -0,0 +1,106 @@
+"""
+bharatmart_collector/routing.py
+
+Routes Prometheus metric families to OCI namespaces ("lanes").
+
+A lane carries everything needed to post a family: namespace, compartment,
+resource group and its own flush interval. Families are matched by longest
+prefix in a character trie, and the result is memoized per family name, so
+after the first scrape a lookup is a single dict hit.
+
+Configuration (.env):
+    METRIC_ROUTES=orders_=business,payments_=business
+    METRIC_LANES=business=bharatmart_business:5
+    # lane=namespace[:flush_seconds[:resource_group[:compartment_ocid]]]
+
+Author: BharatMart Observability
+"""
+
+
+class Lane:
+    __slots__ = ("name", "namespace", "compartment_id", "resource_group", "flush_interval")
+
+    def __init__(self, name, namespace, compartment_id, resource_group=None, flush_interval=None):
+        self.name = name
+        self.namespace = namespace
+        self.compartment_id = compartment_id
+        self.resource_group = resource_group
+        self.flush_interval = flush_interval  # None = follow the scrape interval
+
+    def __repr__(self):
+        return f"Lane({self.name} -> {self.namespace}, flush={self.flush_interval})"
+
+
+class RoutingTable:
+    def __init__(self, default, routes=()):
+        """
+        default -- Lane for families no prefix matches
+        routes  -- iterable of (prefix, Lane)
+        """
+        self.default = default
+        self._trie = {}
+        self._memo = {}
+        lanes = {default.name: default}
+
+        for prefix, lane in routes:
+            node = self._trie
+            for ch in prefix:
+                node = node.setdefault(ch, {})
+            node[None] = lane  # terminal marker
+            lanes[lane.name] = lane
+
+        self.lanes = list(lanes.values())
+
+    def lookup(self, family):
+        lane = self._memo.get(family)
+        if lane is None:
+            lane = self._match(family)
+            self._memo[family] = lane
+        return lane
+
+    def _match(self, family):
+        node = self._trie
+        lane = self.default
+        for ch in family:
+            node = node.get(ch)
+            if node is None:
+                break
+            lane = node.get(None, lane)
+        return lane
+
+
+def parse_lanes(spec, compartment_id):
+    """
+    "business=bharatmart_business:5:business,..." -> {name: Lane}
+    """
+    lanes = {}
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        name, sep, rest = item.partition("=")
+        if not sep or not rest:
+            raise RuntimeError(f"Invalid METRIC_LANES entry '{item}'")
+        parts = rest.split(":")
+        namespace = parts[0]
+        flush = float(parts[1]) if len(parts) > 1 and parts[1] else None
+        resource_group = parts[2] if len(parts) > 2 and parts[2] else None
+        compartment = parts[3] if len(parts) > 3 and parts[3] else compartment_id
+        lanes[name.strip()] = Lane(name.strip(), namespace, compartment, resource_group, flush)
+    return lanes
+
+
+def parse_routes(spec, lanes):
+    """
+    "orders_=business,process_=default" -> [(prefix, Lane)]
+    """
+    routes = []
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        prefix, sep, lane_name = item.partition("=")
+        if not sep or lane_name.strip() not in lanes:
+            raise RuntimeError(f"Invalid METRIC_ROUTES entry '{item}' (unknown lane)")
+        routes.append((prefix.strip(), lanes[lane_name.strip()]))
+    return routes
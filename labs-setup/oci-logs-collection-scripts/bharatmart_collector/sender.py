@@ -0,0 +1,213 @@
+"""
+bharatmart_collector/sender.py
+
+Sender stage: delivers batches to OCI Logging or OCI Monitoring.
+
+Features:
+- One retry loop shared by logs and metrics, steered by a FlowController
+  (adaptive batch size / concurrency, Retry-After, circuit breaker)
+- Up to FlowController.concurrency requests in flight on a worker pool
+- Self-telemetry: batches/entries sent, retries, throttling, drops, latency
+- Metrics are chunked to the OCI limit of 50 streams per request
+
+Author: BharatMart Observability
+"""
+
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import oci
+
+from .flow import FATAL, THROTTLED, classify, retry_after
+
+logger = logging.getLogger(__name__)
+
+MAX_METRIC_STREAMS = 50  # OCI API limit per request
+
+
+def send_with_retry(call, size, flow, telemetry, what="entries"):
+    """
+    Invoke call() until it succeeds, fails fatally or flow.max_retries
+    attempts failed. Returns the OCI response, or None when the batch was
+    dropped. Waiting on Retry-After or an open breaker is not an attempt.
+    """
+    for attempt in range(flow.max_retries):
+        flow.wait_ready()
+        started = time.perf_counter()
+        try:
+            response = call()
+        except Exception as e:
+            latency = time.perf_counter() - started
+            kind = classify(e)
+            flow.on_failure(kind, e)
+            with flow.lock:
+                telemetry.send_latency.observe(latency)
+                if kind == THROTTLED:
+                    telemetry.send_throttled.inc()
+                if kind != FATAL:
+                    telemetry.send_retries.inc()
+
+            if kind == FATAL:
+                logger.error(f"Dropping {size} {what}: non-retryable error {e}")
+                break
+
+            # A Retry-After hold is slept out in flow.wait_ready()
+            delay = 0 if kind == THROTTLED and retry_after(e) else flow.backoff(attempt)
+            logger.warning(
+                f"Error sending {size} {what} (attempt {attempt + 1}/{flow.max_retries}, {kind}): {e}. "
+                f"Retrying in {delay:.1f}s"
+            )
+            time.sleep(delay)
+            continue
+
+        latency = time.perf_counter() - started
+        flow.on_success(latency)
+        with flow.lock:
+            telemetry.send_latency.observe(latency)
+            telemetry.batches_sent.inc()
+            telemetry.entries_sent.inc(size)
+        return response
+    else:
+        logger.error(f"Failed to send {size} {what} after {flow.max_retries} attempts")
+
+    with flow.lock:
+        telemetry.entries_dropped.inc(size)
+    return None
+
+
+def worker_pool(flow, name):
+    return ThreadPoolExecutor(max_workers=flow.concurrency_max, thread_name_prefix=name)
+
+
+class LogSender:
+    def __init__(self, client, log_id, source, log_type, subject, telemetry, flow, event_time=None):
+        """
+        event_time -- callable(line) -> RFC3339 string or None; lines it
+                      cannot date (or all lines, when omitted) get the send time
+        """
+        self.client = client
+        self.log_id = log_id
+        self.source = source
+        self.log_type = log_type
+        self.subject = subject
+        self.telemetry = telemetry
+        self.flow = flow
+        self.event_time = event_time or (lambda line: None)
+        self._pool = worker_pool(flow, f"send-{log_type}")
+
+    def submit(self, records, block=True):
+        """
+        Send on a worker; blocks only while all in-flight slots are taken.
+        Returns a Future resolving to True once OCI accepted the batch,
+        False when it was dropped (None for an empty batch, or when
+        block=False and no slot is free).
+        """
+        if not records:
+            return None
+        if block:
+            self.flow.acquire()
+        elif not self.flow.try_acquire():
+            return None
+        return self._pool.submit(self._send_and_release, records)
+
+    def _send_and_release(self, records):
+        try:
+            return self.send(records) is not None
+        except Exception as e:
+            logger.error(f"Unexpected error sending {len(records)} {self.log_type} logs: {e}")
+            return False
+        finally:
+            self.flow.release()
+
+    def send(self, records):
+        if not records:
+            return None
+
+        LogEntry = oci.loggingingestion.models.LogEntry
+        PutLogsDetails = oci.loggingingestion.models.PutLogsDetails
+        LogEntryBatch = oci.loggingingestion.models.LogEntryBatch
+
+        sent_at = datetime.now(timezone.utc).isoformat()
+        event_time = self.event_time
+        entries = [
+            LogEntry(
+                data=record.data,
+                id=record.entry_id or f"{self.source}-{sent_at}-{i}",
+                time=event_time(record.data) or sent_at,
+            )
+            for i, record in enumerate(records)
+        ]
+
+        body = PutLogsDetails(
+            specversion="1.0",
+            log_entry_batches=[
+                LogEntryBatch(
+                    entries=entries,
+                    source=self.source,
+                    type=self.log_type,
+                    subject=self.subject,
+                )
+            ],
+        )
+
+        return send_with_retry(
+            lambda: self.client.put_logs(
+                log_id=self.log_id,
+                put_logs_details=body,
+                timestamp_opc_agent_processing=datetime.now(timezone.utc),
+            ),
+            len(records),
+            self.flow,
+            self.telemetry,
+            what=f"{self.log_type} logs",
+        )
+
+
+class MetricSender:
+    def __init__(self, client, telemetry, flow):
+        self.client = client
+        self.telemetry = telemetry
+        self.flow = flow
+        self._pool = worker_pool(flow, "send-metrics")
+
+    def send(self, metric_list):
+        """
+        Chunks go out concurrently; returns once all of them finished,
+        since the series cache reuses these objects on the next scrape.
+        """
+        if not metric_list:
+            logger.info("No metrics to send.")
+            return
+
+        chunk_size = max(1, min(MAX_METRIC_STREAMS, self.flow.batch_size))
+        pending = []
+        for i in range(0, len(metric_list), chunk_size):
+            self.flow.acquire()
+            pending.append(self._pool.submit(self._send_chunk, metric_list[i : i + chunk_size]))
+
+        for future in pending:
+            future.result()
+
+    def _send_chunk(self, chunk):
+        PostMetricDataDetails = oci.monitoring.models.PostMetricDataDetails
+        payload = PostMetricDataDetails(metric_data=chunk)
+
+        try:
+            response = send_with_retry(
+                lambda: self.client.post_metric_data(post_metric_data_details=payload),
+                len(chunk),
+                self.flow,
+                self.telemetry,
+                what="metric streams",
+            )
+        finally:
+            self.flow.release()
+        if response is None:
+            return
+
+        failed = response.data.failed_metrics or []
+        if failed:
+            logger.warning(f"OCI partial failure: {len(failed)} metrics in this chunk")
+        logger.info(f"Chunk of {len(chunk)} metrics sent successfully.")
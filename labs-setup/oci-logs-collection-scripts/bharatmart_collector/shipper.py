@@ -0,0 +1,147 @@
+"""
+bharatmart_collector/shipper.py
+
+Log shipper pipeline: reader -> parser -> [reducer] -> batcher -> sender.
+
+Each stage is a plain object (or callable for the parser), so a faster
+implementation of any one stage can be swapped in and benchmarked without
+touching the others. An optional tap sees every parsed record (e.g. the
+access-log metrics stage) without affecting what is shipped; the optional
+reducer runs after it and may drop or collapse records. With a checkpoint
+store, the position of the last batch OCI accepted is persisted (a
+dropped batch holds it there until restart, so nothing OCI never took is
+skipped); with an archive, every shipped batch is also queued for the
+archive's writer thread.
+
+Author: BharatMart Observability
+"""
+
+import logging
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+class LogShipper:
+    def __init__(
+        self,
+        name,
+        reader,
+        parser,
+        batcher,
+        sender,
+        telemetry,
+        diag,
+        tap=None,
+        reducer=None,
+        store=None,
+        archive=None,
+    ):
+        self.name = name
+        self.reader = reader
+        self.parser = parser
+        self.batcher = batcher
+        self.sender = sender
+        self.telemetry = telemetry
+        self.diag = diag
+        self.tap = tap
+        self.reducer = reducer
+        self.store = store
+        self.archive = archive
+        self._in_flight = deque()  # (future, inode, end offset) in submit order
+
+        telemetry.buffered.fn = batcher.__len__
+
+    def flush(self, batch):
+        self.reader.checkpoint()
+        self.diag.debug("flush", "Sending batch of %d entries", len(batch))
+        if self.archive is not None and not self.archive.write(batch):
+            # Writer thread behind (slow disk); logged once per summary interval
+            if not self.diag.counts.get("archive_dropped"):
+                logger.warning("Archive writer is behind; batches are left out of the archive")
+            self.diag.count("archive_dropped")
+        future = self.sender.submit(batch)
+        if self.store is not None:
+            self._in_flight.append((future, self.reader.inode, self.reader.offset))
+            self.save_checkpoint()
+        # Next batch follows the flow controller's current size
+        self.batcher.max_size = self.sender.flow.batch_size
+        self.diag.tick()
+
+    def save_checkpoint(self):
+        """
+        Persist the end of the newest batch that OCI accepted along with
+        every batch before it. The first dropped batch stops checkpointing
+        for this run, so a restart re-reads from its start.
+        """
+        acked = None
+        in_flight = self._in_flight
+        while in_flight:
+            future = in_flight[0][0]
+            if future is not None and not future.done():
+                break
+            if future is not None and not future.result():
+                self.hold_checkpoint(acked)
+                return
+            acked = in_flight.popleft()
+        if acked is not None and not self.store.save(acked[1], acked[2]):
+            in_flight.appendleft(acked)  # rate-limited; retried on the next call
+
+    def hold_checkpoint(self, acked):
+        if acked is not None:
+            self.store.save(acked[1], acked[2], force=True)
+        logger.error(
+            f"A batch was dropped; checkpoint held at {self.store.path} "
+            f"so a restart re-sends from there (later batches may be sent twice)"
+        )
+        self.store = None
+        self._in_flight.clear()
+
+    def emit(self, records):
+        for record in records:
+            batch = self.batcher.add(record)
+            if batch is not None:
+                self.flush(batch)
+
+    def run(self):
+        logger.info(f"Starting {self.name} shipper: {self.reader.path}")
+
+        reader = self.reader
+        entry_id = reader.entry_id
+        parser = self.parser
+        batcher = self.batcher
+        tap = self.tap
+        reducer = self.reducer
+        lines_read = self.telemetry.lines_read
+
+        while True:
+            line = reader.readline()
+
+            if line is None:
+                # Idle → close dedup windows, flush an aged partial batch,
+                # then check rotation
+                if reducer is not None:
+                    self.emit(reducer.expire())
+                if batcher.due():
+                    self.flush(batcher.drain())
+                if self._in_flight:
+                    self.save_checkpoint()
+                self.diag.count("idle_ticks")
+                self.diag.tick()
+                reader.idle()
+                continue
+
+            lines_read.inc()
+            record = parser(line)
+            record.entry_id = entry_id()
+            if tap is not None:
+                tap(record)
+            if reducer is not None:
+                record = reducer(record)
+                if reducer.expire_due:
+                    self.emit(reducer.expire())
+                if record is None:
+                    continue
+            batch = batcher.add(record)
+            if batch is not None:
+                self.flush(batch)
@@ -0,0 +1,343 @@
+"""
+bharatmart_collector/telemetry.py
+
+Lightweight self-telemetry shared by the BharatMart collectors.
+
+Features:
+- Counters, gauges and fixed-bucket histograms backed by plain Python
+  numbers (no locks, no label lookups on the hot path)
+- Callable gauges evaluated only at scrape time (e.g. file lag)
+- Prometheus text exposition on a local /metrics endpoint
+- Output can be parsed by the metrics collector and pushed to OCI
+
+Metric updates are plain attribute increments. The only concurrent
+writers are sender workers, which update their metrics under the flow
+controller's lock; the HTTP thread only ever reads them.
+
+Author: BharatMart Observability
+"""
+
+import os
+import logging
+import threading
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logger = logging.getLogger("collector-telemetry")
+
+# Seconds; tuned for OCI ingestion round-trips
+DEFAULT_LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def process_rss():
+    """
+    Resident set size of this process in bytes (0 where /proc is missing).
+    """
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+# -------------------------------------------------------
+# Metric types
+# -------------------------------------------------------
+class Counter:
+    __slots__ = ("name", "help", "value")
+    kind = "counter"
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def samples(self, labels):
+        yield self.name, labels, self.value
+
+
+class Gauge:
+    __slots__ = ("name", "help", "value", "fn")
+    kind = "gauge"
+
+    def __init__(self, name, help_text, fn=None):
+        self.name = name
+        self.help = help_text
+        self.value = 0
+        self.fn = fn
+
+    def set(self, value):
+        self.value = value
+
+    def samples(self, labels):
+        value = self.value
+        if self.fn is not None:
+            try:
+                value = self.fn()
+            except Exception as e:
+                logger.debug("Gauge %s callback failed: %s", self.name, e)
+                return
+        yield self.name, labels, value
+
+
+class Histogram:
+    __slots__ = ("name", "help", "buckets", "counts", "sum", "count")
+    kind = "histogram"
+
+    def __init__(self, name, help_text, buckets=DEFAULT_LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self, labels):
+        cumulative = 0
+        for bound, n in zip(self.buckets, self.counts):
+            cumulative += n
+            yield f"{self.name}_bucket", {**labels, "le": repr(float(bound))}, cumulative
+        yield f"{self.name}_bucket", {**labels, "le": "+Inf"}, self.count
+        yield f"{self.name}_sum", labels, self.sum
+        yield f"{self.name}_count", labels, self.count
+
+
+# -------------------------------------------------------
+# Registry
+# -------------------------------------------------------
+class SelfTelemetry:
+    """
+    Holds one collector's internal metrics. Every sample carries the
+    constant labels passed in (e.g. {"shipper": "backend_app"}).
+    """
+
+    def __init__(self, **labels):
+        self.labels = {k: str(v) for k, v in labels.items()}
+        self._metrics = []
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help_text):
+        return self._register(Counter(name, help_text))
+
+    def gauge(self, name, help_text, fn=None):
+        return self._register(Gauge(name, help_text, fn))
+
+    def histogram(self, name, help_text, buckets=DEFAULT_LATENCY_BUCKETS):
+        return self._register(Histogram(name, help_text, buckets))
+
+    def render(self):
+        """
+        Prometheus text exposition (format 0.0.4) of all registered metrics.
+        """
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples(self.labels):
+                label_str = ",".join(
+                    f'{k}="{_escape(v)}"' for k, v in labels.items()
+                )
+                lines.append(f"{name}{{{label_str}}} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port, host="127.0.0.1"):
+        """
+        Expose /metrics on a daemon thread. Returns the server, or None when
+        port is 0 (disabled).
+        """
+        if not port:
+            return None
+
+        telemetry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = telemetry.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, fmt, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, int(port)), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        logger.info(f"Self-telemetry available at http://{host}:{port}/metrics")
+        return server
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value):
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+# -------------------------------------------------------
+# Standard collector metric sets
+# -------------------------------------------------------
+class SenderTelemetry(SelfTelemetry):
+    """
+    Metrics shared by everything that sends to OCI (logs or metrics).
+    """
+
+    def __init__(self, **labels):
+        super().__init__(**labels)
+
+        self.batches_sent = self.counter(
+            "collector_batches_sent_total", "Batches accepted by OCI"
+        )
+        self.entries_sent = self.counter(
+            "collector_entries_sent_total", "Entries (log lines or metric streams) accepted by OCI"
+        )
+        self.send_retries = self.counter(
+            "collector_send_retries_total", "Failed send attempts that were retried"
+        )
+        self.entries_dropped = self.counter(
+            "collector_entries_dropped_total", "Entries dropped after exhausting retries"
+        )
+        self.send_latency = self.histogram(
+            "collector_send_latency_seconds", "Latency of each OCI send attempt"
+        )
+        self.send_throttled = self.counter(
+            "collector_send_throttled_total", "Send attempts rejected with 429/503"
+        )
+
+        # Flow control settings (callbacks bound by FlowController)
+        self.flow_batch_size = self.gauge(
+            "collector_flow_batch_size", "Current adaptive batch size"
+        )
+        self.flow_concurrency = self.gauge(
+            "collector_flow_concurrency", "Current limit of in-flight send requests"
+        )
+        self.flow_in_flight = self.gauge(
+            "collector_flow_in_flight", "Send requests currently in flight"
+        )
+        self.breaker_open = self.gauge(
+            "collector_breaker_open", "1 while the send circuit breaker is open or half-open"
+        )
+
+
+class ShipperTelemetry(SenderTelemetry):
+    """
+    The metric set every log shipper exposes.
+
+    bytes_read and file lag are derived from the file offset, which the
+    reader records at batch boundaries and idle ticks rather than per line.
+    """
+
+    def __init__(self, shipper, path):
+        super().__init__(shipper=shipper)
+        self.path = path
+        self.offset = 0
+
+        self.lines_read = self.counter(
+            "collector_lines_read_total", "Log lines read from the tailed file"
+        )
+        self.bytes_read = self.counter(
+            "collector_bytes_read_total", "Bytes consumed from the tailed file"
+        )
+        self.rotations = self.counter(
+            "collector_rotations_total", "Log rotations detected"
+        )
+        self.buffered = self.gauge(
+            "collector_buffered_entries", "Entries waiting for the next batch"
+        )
+        self.lines_deduplicated = self.counter(
+            "collector_lines_deduplicated_total", "Repeated lines collapsed into repeat summaries"
+        )
+        self.lines_sampled_out = self.counter(
+            "collector_lines_sampled_out_total", "Access lines dropped by status-class sampling"
+        )
+        self.dedup_summaries = self.counter(
+            "collector_dedup_summaries_total", "Repeat summary entries shipped"
+        )
+
+        # Send buffer (callbacks bound by SendBuffer)
+        self.queued = self.gauge(
+            "collector_queued_entries", "Entries in the send buffer waiting for a request slot"
+        )
+        self.queue_memory_bytes = self.gauge(
+            "collector_queue_memory_bytes", "Bytes of packed batches held in memory"
+        )
+        self.queue_spill_bytes = self.gauge(
+            "collector_queue_spill_bytes", "Bytes of batches spilled to disk"
+        )
+        self.queue_spilled = self.counter(
+            "collector_queue_spilled_batches_total", "Batches written to disk at the memory ceiling"
+        )
+        self.queue_dropped = self.counter(
+            "collector_queue_dropped_entries_total", "Entries dropped (oldest first) at the ceiling"
+        )
+        self.gauge("collector_rss_bytes", "Resident set size of the collector", fn=process_rss)
+
+        self.archived_entries = self.counter(
+            "collector_archived_entries_total", "Entries written to the local archive"
+        )
+        self.archive_bytes = self.counter(
+            "collector_archive_bytes_total", "Compressed bytes written to the local archive"
+        )
+        self.gauge(
+            "collector_file_lag_bytes",
+            "Bytes written to the file but not yet read (size minus offset)",
+            fn=self._file_lag,
+        )
+
+    def track_offset(self, offset):
+        if offset > self.offset:
+            self.bytes_read.inc(offset - self.offset)
+        self.offset = offset
+
+    def rotated(self):
+        self.rotations.inc()
+        self.offset = 0
+
+    def _file_lag(self):
+        return max(os.stat(self.path).st_size - self.offset, 0)
+
+
+class MetricsTelemetry(SenderTelemetry):
+    """
+    The metric set of the Prometheus -> OCI Monitoring collector.
+    """
+
+    def __init__(self):
+        super().__init__(shipper="backend_metrics")
+
+        self.scrape_latency = self.histogram(
+            "collector_scrape_latency_seconds", "Latency of each /metrics scrape"
+        )
+        self.scrape_failures = self.counter(
+            "collector_scrape_failures_total", "Scrape or conversion cycles that failed"
+        )
+        self.series_skipped = self.counter(
+            "collector_series_skipped_total", "Unchanged series skipped by change-only emission"
+        )
+        self.scrape_interval = self.gauge(
+            "collector_scrape_interval_seconds", "Current scrape interval"
+        )
+        self.series_cached = self.gauge(
+            "collector_series_cached", "Series templates held in the LRU series cache"
+        )
@@ -0,0 +1,127 @@
+"""
+bharatmart_collector/timestamps.py
+
+Event-time extraction: the time a line was written, as an RFC3339 UTC
+string for LogEntry.time, instead of the time it happened to be sent.
+
+Formats:
+- json         : "time" / "timestamp" field, ISO 8601 or epoch (s or ms)
+- nginx_access : [10/Oct/2025:13:55:36 +0000]
+- nginx_error  : 2025/10/10 13:55:36 prefix (server local time)
+
+Consecutive lines share the same second, so the expensive part (parsing
+and time-zone conversion of "YYYY-MM-DD HH:MM:SS" + offset) is cached on
+that second-resolution prefix; a hit only re-attaches the fraction.
+Lines without a recognisable time return None and get the send time.
+
+Author: BharatMart Observability
+"""
+
+import logging
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+CACHE_SIZE = 4096
+
+
+class EventTime:
+    def __init__(self, kind):
+        try:
+            self.extract = getattr(self, f"_{kind}")
+        except AttributeError:
+            raise RuntimeError(f"Unknown time format '{kind}'")
+        self.kind = kind
+        self._cache = {}
+
+    def __call__(self, line):
+        try:
+            return self.extract(line)
+        except (ValueError, IndexError, OverflowError):
+            return None
+
+    def _cached(self, key, convert):
+        base = self._cache.get(key)
+        if base is None:
+            if len(self._cache) >= CACHE_SIZE:
+                self._cache.clear()
+            base = self._cache[key] = convert()
+        return base
+
+    # ---------------------------------------------------
+    # Formats
+    # ---------------------------------------------------
+    def _json(self, line):
+        i = line.find('"time"')
+        if i >= 0:
+            i += 6
+        else:
+            i = line.find('"timestamp"')
+            if i < 0:
+                return None
+            i += 11
+
+        i = line.index(":", i) + 1
+        if line[i] == " ":
+            i += 1
+
+        if line[i] == '"':
+            return self._iso(line[i + 1 : line.index('"', i + 1)])
+
+        end = line.find(",", i)
+        return self._epoch(float(line[i : end if end > 0 else line.index("}", i)]))
+
+    def _iso(self, value):
+        # 2025-10-10T13:55:36.123Z / .123+05:30 / 2025-10-10 13:55:36
+        if len(value) < 19:
+            return None
+        rest = value[19:]
+        if rest[-1:] in ("Z", "z"):
+            fraction, tz = rest[:-1], ""
+        elif len(rest) >= 6 and rest[-6] in "+-":
+            fraction, tz = rest[:-6], rest[-6:]  # +05:30
+        elif len(rest) >= 5 and rest[-5] in "+-":
+            fraction, tz = rest[:-5], rest[-5:]  # +0530
+        else:
+            fraction, tz = rest, ""
+
+        key = value[:19] + tz
+        base = self._cache.get(key)
+        if base is None:
+            base = self._cached(key, lambda: _iso_base(value[:19], tz))
+        return f"{base}{fraction[:7]}Z"
+
+    def _epoch(self, value):
+        millis = int(value) if value > 1e11 else int(round(value * 1000))
+        whole, millis = divmod(millis, 1000)
+        base = self._cached(
+            whole,
+            lambda: datetime.fromtimestamp(whole, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S"),
+        )
+        return f"{base}.{millis:03d}Z"
+
+    def _nginx_access(self, line):
+        start = line.index("[") + 1
+        value = line[start : line.index("]", start)]
+        return self._cached(
+            value,
+            lambda: _utc(datetime.strptime(value, "%d/%b/%Y:%H:%M:%S %z")) + "Z",
+        )
+
+    def _nginx_error(self, line):
+        value = line[:19]
+        return self._cached(
+            value,
+            lambda: _utc(datetime.strptime(value, "%Y/%m/%d %H:%M:%S").astimezone()) + "Z",
+        )
+
+
+def _utc(dt):
+    return dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def _iso_base(seconds_part, tz):
+    dt = datetime.fromisoformat(seconds_part.replace(" ", "T"))
+    if not tz:
+        return dt.strftime("%Y-%m-%dT%H:%M:%S")  # no offset: taken as UTC
+    return _utc(datetime.fromisoformat(seconds_part.replace(" ", "T") + tz))
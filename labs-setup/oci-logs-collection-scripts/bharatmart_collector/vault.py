@@ -0,0 +1,133 @@
+"""
+bharatmart_collector/vault.py
+
+Cached OCI Vault secret lookups for the collectors.
+
+Features:
+- get(secret_ocid) returns the decoded secret from memory while it is
+  younger than the TTL; only a miss calls Vault (get_secret_bundle)
+- Refresh-ahead: a daemon thread re-fetches every cached secret once it
+  reaches refresh_ahead * TTL, so readers never wait on Vault
+- Vault unavailable: the cached value keeps being served (with a
+  warning) until it is max_stale seconds old
+- Optional encrypted disk cache (Fernet, mode 0600) so a restart serves
+  known secrets without waiting on Vault
+
+The disk cache key should not live next to the cache file (e.g. inject it
+through the service manager rather than .env on the same disk).
+
+Configuration (.env):
+    SECRET_TTL_SECONDS=300
+    SECRET_REFRESH_AHEAD=0.8
+    SECRET_MAX_STALE_SECONDS=3600
+    SECRET_CACHE_FILE=/var/lib/bharatmart-collector/secrets.cache
+    SECRET_CACHE_KEY=<Fernet key>
+
+Author: BharatMart Observability
+"""
+
+import os
+import json
+import time
+import base64
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class SecretProvider:
+    def __init__(
+        self,
+        client,
+        ttl=300.0,
+        refresh_ahead=0.8,
+        max_stale=3600.0,
+        cache_path=None,
+        cache_key=None,
+    ):
+        self.client = client
+        self.ttl = ttl
+        self.refresh_ahead = refresh_ahead
+        self.max_stale = max_stale
+        self.cache_path = cache_path
+
+        self._entries = {}  # secret ocid -> (value, fetched_at epoch seconds)
+        self._lock = threading.Lock()
+        self._fernet = None
+        if cache_path:
+            if not cache_key:
+                raise RuntimeError("SECRET_CACHE_FILE requires SECRET_CACHE_KEY")
+            try:
+                from cryptography.fernet import Fernet
+            except ImportError:
+                raise RuntimeError("SECRET_CACHE_FILE requires the 'cryptography' package")
+            self._fernet = Fernet(cache_key)
+            self._load()
+
+        threading.Thread(target=self._refresh_loop, name="secret-refresh", daemon=True).start()
+
+    def get(self, secret_id):
+        entry = self._entries.get(secret_id)
+        if entry is not None and time.time() - entry[1] < self.ttl:
+            return entry[0]
+        try:
+            return self._fetch(secret_id)
+        except Exception as e:
+            if entry is not None and time.time() - entry[1] < self.max_stale:
+                logger.warning(f"Vault lookup failed, serving cached {secret_id}: {e}")
+                return entry[0]
+            raise RuntimeError(f"Unable to read secret {secret_id}: {e}")
+
+    def _fetch(self, secret_id):
+        bundle = self.client.get_secret_bundle(secret_id).data
+        value = base64.b64decode(bundle.secret_bundle_content.content).decode()
+        with self._lock:
+            self._entries[secret_id] = (value, time.time())
+            if self._fernet is not None:
+                self._save()
+        return value
+
+    # ---------------------------------------------------
+    # Refresh-ahead
+    # ---------------------------------------------------
+    def _refresh_loop(self):
+        interval = max(1.0, min(60.0, self.ttl * (1.0 - self.refresh_ahead) / 2))
+        while True:
+            time.sleep(interval)
+            due = time.time() - self.ttl * self.refresh_ahead
+            for secret_id, (_, fetched_at) in list(self._entries.items()):
+                if fetched_at > due:
+                    continue
+                try:
+                    self._fetch(secret_id)
+                    logger.debug("Refreshed secret %s", secret_id)
+                except Exception as e:
+                    logger.warning(f"Refresh of secret {secret_id} failed (serving cached): {e}")
+
+    # ---------------------------------------------------
+    # Encrypted disk cache (called with the lock held / at startup)
+    # ---------------------------------------------------
+    def _load(self):
+        try:
+            with open(self.cache_path, "rb") as f:
+                state = json.loads(self._fernet.decrypt(f.read()))
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable secret cache {self.cache_path}: {e}")
+            return
+
+        oldest = time.time() - self.max_stale
+        for secret_id, (value, fetched_at) in state.items():
+            if fetched_at > oldest:
+                self._entries[secret_id] = (value, fetched_at)
+        logger.info(f"Loaded {len(self._entries)} secrets from {self.cache_path}")
+
+    def _save(self):
+        tmp = f"{self.cache_path}.tmp"
+        token = self._fernet.encrypt(json.dumps(self._entries).encode())
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(token)
+        os.replace(tmp, self.cache_path)
@@ -10,6 +10,7 @@ nohup python3 backend-metrics-to-oci.py > metrics.out 2>&1 &
 nohup python3 backend-logs-to-oci.py > backend-logs.out 2>&1 &
 nohup python3 frontend-access-logs-to-oci.py > fe-access.out 2>&1 &
 nohup python3 frontend-error-logs-to-oci.py > fe-error.out 2>&1 &
+# Equivalent: python3 -m bharatmart_collector {backend-metrics|backend-logs|nginx-access|nginx-error}
 ps aux | grep python
 
 
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Import bharatmart_collector from the scripts directory whatever pytest's cwd
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SCRIPTS_DIR not in sys.path:
+    sys.path.insert(0, SCRIPTS_DIR)
@@ -0,0 +1,80 @@
+import os
+import json
+import logging
+import threading
+
+from bharatmart_collector.archive import Archive, ArchiveWriter, Bloom, read_index, segments
+from bharatmart_collector.parser import parse_raw
+
+
+def api_line(stamp, i=0, status=200):
+    return json.dumps({"timestamp": stamp, "level": "info", "status": status, "request_id": f"req-{i}"})
+
+
+class StalledArchive:
+    name = "backend-logs"
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.written = []
+
+    def write(self, records):
+        self.release.wait()
+        self.written.append(records)
+
+    def seal(self):
+        pass
+
+
+def test_write_does_not_wait_for_the_disk():
+    archive = StalledArchive()
+    writer = ArchiveWriter(archive, max_batches=2)
+    # One batch held by the writer thread, two queued, the fourth dropped
+    results = [writer.write([i]) for i in range(4)]
+    assert results[:2] == [True, True]
+    assert results[-1] is False and writer.dropped >= 1
+    archive.release.set()
+    writer.join()
+    assert archive.written[0] == [0]
+
+
+def test_write_failure_is_logged_and_the_writer_keeps_going(caplog):
+    class FailingOnce(StalledArchive):
+        def write(self, records):
+            if not self.written:
+                self.written.append(None)
+                raise OSError("disk full")
+            self.written.append(records)
+
+    archive = FailingOnce()
+    writer = ArchiveWriter(archive)
+    with caplog.at_level(logging.INFO):
+        writer.write([1])
+        writer.write([2])
+        writer.join()
+    assert archive.written == [None, [2]]
+    assert "Archive write failed: disk full" in caplog.text
+    assert "recovered after 1 failed batches" in caplog.text
+
+
+def test_block_time_range_covers_out_of_order_lines(tmp_path):
+    archive = Archive(str(tmp_path), "backend-logs", "json")
+    archive.write([
+        parse_raw(api_line("2025-10-10T13:55:10Z")),
+        parse_raw(api_line("2025-10-10T13:54:00Z")),  # late line
+        parse_raw(api_line("2025-10-10T13:55:05Z")),
+    ])
+    (_, _, count, first, last), = read_index(archive.path)
+    assert (count, first, last) == (3, "2025-10-10T13:54:00", "2025-10-10T13:55:10")
+
+
+def test_unsealed_segment_gets_its_bloom_on_startup(tmp_path):
+    archive = Archive(str(tmp_path), "backend-logs", "json")
+    archive.write([parse_raw(api_line("2025-10-10T13:55:10Z", 42, 502))])
+    path = archive.path  # left unsealed, as after a crash
+
+    Archive(str(tmp_path), "backend-logs", "json")
+    bloom = Bloom.load(f"{path[:-4]}.bloom")
+    assert "rid:req-42" in bloom and "status:502" in bloom
+    assert len(segments(str(tmp_path), "backend-logs")) == 2
+    assert os.path.exists(f"{path[:-4]}.idx")
@@ -0,0 +1,79 @@
+import os
+import logging
+from collections import deque
+from concurrent.futures import Future
+
+import pytest
+
+from bharatmart_collector.catchup import CatchUpWorker, plan
+from bharatmart_collector.checkpoint import Checkpoint, resume_offset
+from bharatmart_collector.flow import FlowController
+from bharatmart_collector.parser import parse_raw
+from bharatmart_collector.shipper import LogShipper
+
+
+def shipper_with(store):
+    # Only the checkpoint bookkeeping is exercised
+    shipper = LogShipper.__new__(LogShipper)
+    shipper.name = "backend-logs"
+    shipper.store = store
+    shipper._in_flight = deque()
+    return shipper
+
+
+def test_checkpoint_holds_at_first_dropped_batch(tmp_path):
+    store = Checkpoint(str(tmp_path / "backend-logs.checkpoint.json"), min_interval=0)
+    shipper = shipper_with(store)
+    futures = [Future() for _ in range(4)]
+    for i, future in enumerate(futures):
+        shipper._in_flight.append((future, 7, (i + 1) * 100))
+
+    futures[0].set_result(True)
+    futures[2].set_result(True)
+    shipper.save_checkpoint()
+    assert store.load() == (7, 100)
+
+    futures[1].set_result(False)  # dropped
+    futures[3].set_result(True)
+    shipper.save_checkpoint()
+    assert store.load() == (7, 100)
+    assert shipper.store is None  # no later save can skip past it
+
+
+class DroppingSender:
+    flow = FlowController(batch_size=10, batch_min=10)
+
+    def __init__(self, accept):
+        self.accept = accept
+        self.sent = 0
+
+    def send(self, batch):
+        self.sent += 1
+        return object() if self.sent <= self.accept else None
+
+
+def test_catch_up_range_fails_when_a_batch_is_dropped(tmp_path):
+    path = tmp_path / "api.log"
+    path.write_text("".join(f"line {i}\n" for i in range(30)))
+    size = os.path.getsize(path)
+    worker = CatchUpWorker(parse_raw, DroppingSender(accept=1), "host")
+
+    with pytest.raises(RuntimeError, match="not accepted"):
+        worker.ship(str(path), 0, size, os.stat(path).st_ino, False)
+
+
+def test_rotation_since_checkpoint_reports_skipped_bytes(tmp_path, caplog):
+    live = tmp_path / "api.log"
+    live.write_text("a" * 99 + "\n")
+    inode = os.stat(live).st_ino
+    os.rename(live, tmp_path / "api.log.1")
+    live.write_text("new\n")
+
+    with caplog.at_level(logging.WARNING):
+        assert resume_offset((inode, 40), str(live)) is None
+    assert "skipping 60 unshipped bytes" in caplog.text
+
+    caplog.clear()
+    with caplog.at_level(logging.WARNING):
+        plan([], str(live), (inode, 40), chunk_bytes=1 << 20)
+    assert "skipping 60 unshipped bytes" in caplog.text
@@ -0,0 +1,34 @@
+import os
+import sys
+import argparse
+
+import pytest
+
+from bharatmart_collector import config
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks"))
+
+
+def test_skip_dotenv_switch(monkeypatch):
+    def fail():
+        raise AssertionError(".env must not be loaded")
+
+    monkeypatch.setattr(config, "load_dotenv", fail)
+    monkeypatch.setattr(config, "_loaded", False)
+    monkeypatch.setenv("BHARATMART_SKIP_DOTENV", "1")
+    config.load_env()
+
+
+def test_bench_env_pins_stateful_settings(monkeypatch, tmp_path):
+    run_e2e = pytest.importorskip("run_e2e")
+    monkeypatch.setenv("LOG_CHECKPOINT_DIR", os.path.expanduser("~/.bharatmart-collector"))
+    monkeypatch.setenv("ARCHIVE_DIR", "/var/lib/bharatmart-collector/archive")
+    monkeypatch.setenv("LOG_DEDUP", "all")
+
+    env = run_e2e.build_env(argparse.Namespace(collector="backend-logs", env=[]), "http://127.0.0.1:1", str(tmp_path))
+
+    assert env["BHARATMART_SKIP_DOTENV"] == "1"
+    assert env["LOG_CHECKPOINT_DIR"].startswith(str(tmp_path))
+    assert env["ARCHIVE_DIR"] == ""
+    assert env["LOG_DEDUP"] == ""
+    assert env["ACCESS_LOG_METRICS"] == "false"
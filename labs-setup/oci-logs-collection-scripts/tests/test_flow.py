@@ -0,0 +1,52 @@
+import time
+import threading
+
+from bharatmart_collector.flow import FATAL, RETRYABLE, THROTTLED, FlowController
+
+
+def open_breaker(cooldown=0.05):
+    flow = FlowController(breaker_failures=1, breaker_cooldown=cooldown)
+    flow.on_failure(RETRYABLE, Exception("connection reset"))
+    assert flow.state == "open"
+    return flow
+
+
+def test_half_open_lets_a_single_probe_through():
+    flow = open_breaker()
+    passed = []
+
+    def worker():
+        flow.wait_ready()
+        passed.append(threading.current_thread().name)
+
+    workers = [threading.Thread(target=worker, daemon=True) for _ in range(6)]
+    for thread in workers:
+        thread.start()
+    time.sleep(0.3)
+    assert len(passed) == 1
+    assert flow.state == "half_open"
+
+    flow.on_success(0.01)
+    for thread in workers:
+        thread.join(1)
+    assert len(passed) == 6
+    assert flow.state == "closed"
+
+
+def test_throttled_probe_reopens_with_longer_cooldown():
+    flow = open_breaker()
+    time.sleep(0.06)
+    flow.wait_ready()
+    flow.on_failure(THROTTLED, Exception("429"))
+    assert flow.state == "open"
+    assert flow._cooldown == 0.1
+
+
+def test_fatal_probe_closes_the_breaker():
+    flow = open_breaker()
+    time.sleep(0.06)
+    flow.wait_ready()
+    assert flow.state == "half_open"
+    flow.on_failure(FATAL, Exception("400 InvalidParameter"))
+    assert flow.state == "closed"
+    assert flow._cooldown == 0.05
@@ -0,0 +1,42 @@
+from datetime import datetime, timezone
+
+from bharatmart_collector.logmetrics import AccessLogMetrics
+from bharatmart_collector.parser import parse_raw
+
+
+def access_line(i, status=200, size=512, request_time=0.120):
+    return (
+        f'10.0.0.{i % 250} - - [10/Oct/2025:13:55:36 +0000] "GET /api/products/{i} HTTP/1.1" '
+        f'{status} {size} "-" "curl/8.0" {request_time:.3f} "10.0.1.5:3000"'
+    )
+
+
+def test_window_of_n_requests_emits_one_datapoint_per_stream():
+    metrics = AccessLogMetrics(None, "bharatmart_frontend", "ocid1.compartment.oc1..test", "web-1")
+    n = 40
+    for i in range(n):
+        metrics.observe(parse_raw(access_line(i)))
+
+    timestamp = datetime.now(timezone.utc)
+    streams = {m.name: m for m in metrics.build(metrics._stats, timestamp)}
+
+    requests = streams["nginx_requests"]
+    assert requests.dimensions == {
+        "host": "web-1",
+        "upstream": "10.0.1.5:3000",
+        "status_class": "2xx",
+        "route": "/api/products/:id",
+    }
+    assert len(requests.datapoints) == 1
+    assert requests.datapoints[0].value == n
+    assert requests.datapoints[0].count is None  # OCI: count = occurrences of value
+
+    response_bytes = streams["nginx_response_bytes"].datapoints
+    assert len(response_bytes) == 1
+    assert response_bytes[0].value == n * 512
+    assert response_bytes[0].count is None
+
+    p99 = streams["nginx_request_time_ms_p99"].datapoints
+    assert len(p99) == 1
+    assert abs(p99[0].value - 120) <= 120 * 0.02
+    assert p99[0].count is None
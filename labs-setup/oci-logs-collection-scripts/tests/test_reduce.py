@@ -0,0 +1,37 @@
+import json
+
+from bharatmart_collector.parser import parse_raw
+from bharatmart_collector.reduce import Reducer
+from bharatmart_collector.telemetry import ShipperTelemetry
+
+
+def access_line(status, i=0):
+    return (
+        f'10.0.0.{i} - - [10/Oct/2025:13:55:{i:02d} +0000] "GET /api/orders HTTP/1.1" '
+        f'{status} 512 "-" "curl/8.0" 0.0{i} "10.0.1.5:3000"'
+    )
+
+
+def error_line(status, i=0):
+    return json.dumps({"level": "error", "msg": "upstream failed", "status": status, "request_id": f"req-{i}"})
+
+
+def shipped(reducer, lines):
+    return [record for record in map(reducer, map(parse_raw, lines)) if record is not None]
+
+
+def test_200_and_500_on_the_same_path_both_ship():
+    reducer = Reducer(ShipperTelemetry("test", "access.log"), dedup="all")
+    out = shipped(reducer, [access_line(200, 1), access_line(500, 2), access_line(200, 3)])
+    assert [record.data.split('"')[2].split()[0] for record in out] == ["200", "500"]
+
+
+def test_distinct_error_statuses_are_not_collapsed():
+    reducer = Reducer(ShipperTelemetry("test", "api.log"), dedup="errors")
+    out = shipped(reducer, [error_line(502, 1), error_line(504, 2), error_line(502, 3)])
+    assert [json.loads(record.data)["status"] for record in out] == [502, 504]
+
+    summaries = reducer.expire(force=True)
+    assert len(summaries) == 1
+    assert json.loads(summaries[0].data)["status"] == 502
+    assert json.loads(summaries[0].data)["repeated"] == 1